@@ -6,9 +6,10 @@ default model for the flask app instance
 
 
 import os
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from json import dumps as js
+from api.v1.compression import compress
 from api.v1.views import amenity_views
 from api.v1.views import app_views
 from api.v1.views import city_views
@@ -17,6 +18,8 @@ from api.v1.views import review_views
 from api.v1.views import state_views
 from api.v1.views import user_views
 from api.v1.views import amenity_place_views
+from api.v1.views import batch_views
+from api.v1.views import ndjson
 from models import storage
 
 
@@ -27,13 +30,30 @@ app = Flask(__name__)
 def apply_caching(response):
     """
     setting the "Content-Type" header to
-    "application/json".
+    "application/json", unless the view streams NDJSON.
     """
-    response.headers["Content-Type"] = "application/json"
+    if response.mimetype != ndjson:
+        response.headers["Content-Type"] = "application/json"
 
     return response
 
 
+@app.after_request
+def wait_for_storage(response):
+    """
+    holds the response to a write request until storage has written
+    it, unless the client sent "Prefer: respond-async".
+    """
+    if (request.method in ("POST", "PUT", "DELETE") and
+            "respond-async" not in request.headers.get("Prefer", "")):
+        storage.sync()
+
+    return response
+
+
+app.after_request(compress)
+
+
 cors = CORS(app, origins="0.0.0.0")
 url_prefix = '/api/v1'
 
@@ -46,6 +66,7 @@ app.register_blueprint(state_views, url_prefix=url_prefix)
 app.register_blueprint(user_views, url_prefix=url_prefix)
 app.register_blueprint(review_views, url_prefix=url_prefix)
 app.register_blueprint(amenity_place_views, url_prefix=url_prefix)
+app.register_blueprint(batch_views, url_prefix=url_prefix)
 
 
 @app.teardown_appcontext
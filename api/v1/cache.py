@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+
+"""
+Model that caches the responses of the API collection routes
+"""
+
+
+from collections import OrderedDict
+import json
+import os
+from threading import Lock
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# int - number of responses kept in memory, 0 to cache nothing
+cache_size = int(os.environ.get("HBNB_API_CACHE_SIZE", 256))
+# int - bodies longer than this many bytes are not cached
+max_body = int(os.environ.get("HBNB_API_CACHE_MAX_BODY", 1 << 20))
+# string - URL of a Redis server to share the cache between processes
+redis_url = os.environ.get("HBNB_API_CACHE_URL")
+# int - seconds a response stays in Redis
+redis_ttl = int(os.environ.get("HBNB_API_CACHE_TTL", 3600))
+
+
+class MemoryCache:
+    """keeps the most recently used responses in this process"""
+
+    def __init__(self, size):
+        """
+        Instantiates an empty MemoryCache.
+
+        Args:
+          size: maximum number of responses to keep.
+        """
+        self.size = size
+        # OrderedDict - key: response, least recently used first
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        """returns the response stored under key, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """stores the response entry under key"""
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+
+class RedisCache:
+    """keeps responses in a Redis server shared by every process"""
+
+    def __init__(self, url, ttl):
+        """
+        Instantiates a RedisCache.
+
+        Args:
+          url: URL of the Redis server.
+          ttl: seconds a response stays in the server.
+        """
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key):
+        """returns the response stored under key, or None"""
+        data = self.client.get("hbnb:" + key)
+        if data is None:
+            return None
+        entry = json.loads(data)
+        entry["body"] = entry["body"].encode()
+        return entry
+
+    def set(self, key, entry):
+        """stores the response entry under key"""
+        entry = dict(entry, body=entry["body"].decode())
+        self.client.set("hbnb:" + key, json.dumps(entry), ex=self.ttl)
+
+
+if redis_url and redis is not None:
+    backend = RedisCache(redis_url, redis_ttl)
+elif cache_size > 0:
+    backend = MemoryCache(cache_size)
+else:
+    backend = None
+
+
+def lookup(key):
+    """
+    returns the response stored under key, a dictionary of its
+    body, mimetype and headers, or None
+    """
+    if backend is None:
+        return None
+    return backend.get(key)
+
+
+def store(key, response):
+    """
+    stores the body of response under key as it is sent, unless it
+    is longer than HBNB_API_CACHE_MAX_BODY bytes
+
+    Args:
+      key: key of the response, which must change with its body.
+      response: the response of the view, streamed or not.
+    """
+    if backend is None:
+        return
+    headers = {name: response.headers[name]
+               for name in ("Link",) if name in response.headers}
+    mimetype = response.mimetype
+
+    def tee(chunks):
+        parts = []
+        size = 0
+        for chunk in chunks:
+            if parts is not None:
+                size += len(chunk)
+                if size > max_body:
+                    parts = None
+                else:
+                    parts.append(chunk)
+            yield chunk
+        if parts is not None:
+            backend.set(key, {"body": b"".join(parts),
+                              "mimetype": mimetype, "headers": headers})
+
+    response.response = tee(response.iter_encoded())
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+
+"""
+Model that compresses the responses of the API
+"""
+
+
+from collections import OrderedDict
+from hashlib import sha1
+import os
+from threading import Lock
+import zlib
+from flask import request
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# int - bodies shorter than this many bytes are sent as they are
+min_size = int(os.environ.get("HBNB_API_COMPRESS_MIN", 1024))
+# int - number of compressed bodies kept for the next identical response
+cache_size = int(os.environ.get("HBNB_API_COMPRESS_CACHE", 128))
+# int - zlib level of gzip, from 1 (fast) to 9 (small)
+gzip_level = int(os.environ.get("HBNB_API_COMPRESS_LEVEL", 6))
+
+# OrderedDict - (encoding, SHA-1 of body): compressed body, oldest first
+cache = OrderedDict()
+cache_lock = Lock()
+
+
+def compress(response):
+    """
+    compresses the body of response with the best encoding the
+    client accepts, brotli if it is installed or gzip. Streamed
+    bodies are compressed as they are sent, others when they
+    are longer than HBNB_API_COMPRESS_MIN bytes, reusing the
+    result of an earlier identical body.
+
+    Args:
+      response: the response of the view.
+
+    Returns:
+      the response, compressed or not.
+    """
+    if (response.status_code < 200 or response.status_code in (204, 304) or
+            response.direct_passthrough or
+            "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(),
+                                            encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        response.set_data(compress_body(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    # the compressed bytes differ, so the entity tag is only weak now
+    tag, weak = response.get_etag()
+    if tag and not weak:
+        response.set_etag(tag, weak=True)
+    return response
+
+
+def compress_body(body, encoding):
+    """returns body compressed with encoding, from the cache if there"""
+    key = (encoding, sha1(body).digest())
+    with cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    if encoding == "br":
+        data = brotli.compress(body)
+    else:
+        encoder = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+        data = encoder.compress(body) + encoder.flush()
+    if cache_size > 0:
+        with cache_lock:
+            cache[key] = data
+            while len(cache) > cache_size:
+                cache.popitem(last=False)
+    return data
+
+
+def compress_stream(chunks, encoding):
+    """yields chunks compressed with encoding as they come"""
+    if encoding == "br":
+        encoder = brotli.Compressor()
+        process, finish = encoder.process, encoder.finish
+    else:
+        encoder = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+        process, finish = encoder.compress, encoder.flush
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
@@ -5,8 +5,19 @@ Model that handles import and export of views
 """
 
 
-from flask import Blueprint
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from flask import Blueprint, Response, request, stream_with_context
 from flask_cors import CORS
+from json import dumps as js, loads
+from urllib.parse import urlencode
+from werkzeug.http import generate_etag, is_resource_modified
+from api.v1 import cache
+from models import storage
+from models.base_model import format_time, parse_time
+from models.engine.sorted_index import sort_key
+
+ndjson = "application/x-ndjson"
 
 app_views = Blueprint('app_views', __name__)
 state_views = Blueprint('state_views', __name__)
@@ -16,6 +27,7 @@ user_views = Blueprint('user_views', __name__)
 place_views = Blueprint('place_views', __name__)
 review_views = Blueprint('review_views', __name__)
 amenity_place_views = Blueprint("amenity_place_views", __name__)
+batch_views = Blueprint("batch_views", __name__)
 
 CORS(app_views)
 CORS(state_views)
@@ -25,6 +37,199 @@ CORS(user_views)
 CORS(place_views)
 CORS(review_views)
 CORS(amenity_place_views)
+CORS(batch_views)
+
+
+def js_list(objs):
+    """
+    Streams the dictionaries of objects as a JSON array,
+    one element at a time, so the list and the full string
+    are never built in memory. A client asking for NDJSON,
+    with ?format=ndjson or "Accept: application/x-ndjson",
+    gets one JSON object per line instead, and one giving
+    ?fields= only gets those attributes.
+
+    Args:
+      objs: iterable of the objects to serialize.
+
+    Returns:
+      a response streaming the same text as
+      js([obj.to_dict() for obj in objs]), or its NDJSON form.
+    """
+    fields = requested_fields()
+
+    def generate():
+        separator = "["
+        for obj in objs:
+            yield separator + js(obj.to_dict(fields))
+            separator = ", "
+        yield "]" if separator == ", " else "[]"
+
+    def generate_lines():
+        for obj in objs:
+            yield js(obj.to_dict(fields)) + "\n"
+
+    if wants_ndjson():
+        response = Response(stream_with_context(generate_lines()),
+                            mimetype=ndjson)
+    else:
+        response = Response(stream_with_context(generate()),
+                            mimetype="application/json")
+    response.vary.add("Accept")
+    return response
+
+
+def requested_fields():
+    """
+    returns the attribute names listed in the fields query
+    parameter, as in ?fields=id,name, or None to send them all
+    """
+    fields = request.args.get("fields")
+    if fields is None:
+        return None
+    return [name for name in fields.split(",") if name]
+
+
+def wants_ndjson():
+    """tells whether the client asked for a list as NDJSON"""
+    if "format" in request.args:
+        return request.args["format"] == "ndjson"
+    return request.accept_mimetypes.best_match(
+        ["application/json", ndjson]) == ndjson
+
+
+def js_page(cls, parent_cls=None, parent_id=None):
+    """
+    Streams the objects of a class, or the children of a
+    parent, with js_list. With the limit query parameter,
+    at most limit objects are sent in (created_at, id) order,
+    starting after the cursor query parameter, and the Link
+    header gives the URL of the next page. With the fields
+    query parameter, the objects come in that order too, and
+    the storage engine only loads the fields asked for.
+
+    The ETag comes from the storage generation of the objects,
+    so an If-None-Match still matching it gets a 304 without
+    the objects being read, and the response is cached under
+    it: a change in storage gives a new ETag, which misses.
+
+    Args:
+      cls: class of the objects to send.
+      parent_cls: class of the parent, if any.
+      parent_id: unique identifier of the parent.
+
+    Returns:
+      a streamed response, a 304 response, or an error and a
+      status code of 400 for an invalid limit or cursor.
+    """
+    tag = etag(storage.generation(cls, parent_cls, parent_id))
+    if not is_resource_modified(request.environ, etag=tag):
+        return not_modified(tag)
+    cached = cache.lookup(tag)
+    if cached is not None:
+        response = Response(cached["body"], mimetype=cached["mimetype"],
+                            headers=cached["headers"])
+        response.vary.add("Accept")
+        response.set_etag(tag)
+        return response
+
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    fields = requested_fields()
+    if limit is None and cursor is None and fields is None:
+        if parent_cls is None:
+            response = js_list(storage.all(cls).values())
+        else:
+            response = js_list(
+                storage.children(parent_cls, parent_id, cls).values())
+    else:
+        try:
+            limit = None if limit is None else int(limit)
+            if limit is not None and limit < 1:
+                raise ValueError(limit)
+        except ValueError:
+            return js({"error": "Invalid limit"}), 400
+        try:
+            after = None if cursor is None else decode_cursor(cursor)
+        except (TypeError, ValueError):
+            return js({"error": "Invalid cursor"}), 400
+
+        objs = storage.page(cls, limit, after, parent_cls, parent_id, fields)
+        response = js_list(objs)
+        if limit is not None and len(objs) == limit:
+            args = request.args.to_dict()
+            args["cursor"] = encode_cursor(objs[-1])
+            response.headers["Link"] = '<{}?{}>; rel="next"'.format(
+                request.base_url, urlencode(args))
+    cache.store(tag, response)
+    response.set_etag(tag)
+    return response
+
+
+def js_object(obj):
+    """
+    Sends the dictionary of an object, with the ?fields= asked
+    for. Its ETag and Last-Modified come from its updated_at,
+    so an If-None-Match or If-Modified-Since still matching
+    them gets a 304 without to_dict() being called.
+
+    Args:
+      obj: the object to send.
+
+    Returns:
+      a JSON response, or a 304 response.
+    """
+    updated_at = getattr(obj, "updated_at", None)
+    if not isinstance(updated_at, datetime):
+        updated_at = None
+    tag = etag(obj.__class__.__name__, obj.id, updated_at)
+    if not is_resource_modified(request.environ, etag=tag,
+                                last_modified=updated_at):
+        return not_modified(tag, updated_at)
+
+    response = Response(js(obj.to_dict(requested_fields())),
+                        mimetype="application/json")
+    response.set_etag(tag)
+    response.last_modified = updated_at
+    return response
+
+
+def etag(*parts):
+    """returns the ETag of the representation of parts asked for"""
+    return generate_etag(js([request.full_path, wants_ndjson()] +
+                            [str(part) for part in parts]).encode())
+
+
+def not_modified(tag, last_modified=None):
+    """returns an empty 304 response with the given validators"""
+    response = Response(status=304)
+    response.set_etag(tag)
+    response.last_modified = last_modified
+    response.vary.add("Accept")
+    return response
+
+
+def encode_cursor(obj):
+    """returns the opaque cursor of the page that follows obj"""
+    created_at, id = sort_key(obj)
+    return urlsafe_b64encode(
+        js([format_time(created_at), id]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    returns the (created_at, id) that cursor starts after, or raises
+    ValueError unless it holds two strings and a naive created_at
+    """
+    value = loads(urlsafe_b64decode(cursor.encode()))
+    if (type(value) is not list or len(value) != 2 or
+            any(type(part) is not str for part in value)):
+        raise ValueError("invalid cursor")
+    created_at = parse_time(value[0])
+    if created_at.tzinfo is not None:
+        raise ValueError("invalid cursor")
+    return (created_at, value[1])
+
 
 from api.v1.views.amenities import *
 from api.v1.views.cities import *
@@ -34,3 +239,4 @@ from api.v1.views.places_reviews import *
 from api.v1.views.states import *
 from api.v1.views.users import *
 from api.v1.views.places_amenities import *
+from api.v1.views.batch import *
@@ -6,7 +6,7 @@ Models for the routes of the amenity_views
 
 from flask import abort, request
 from json import dumps as js
-from api.v1.views import amenity_views
+from api.v1.views import amenity_views, js_object, js_page
 from models import storage
 from models.amenity import Amenity
 
@@ -21,14 +21,7 @@ def get_all_amenities():
     Returns:
       a JavaScript array of dictionaries.
     """
-    amenities = storage.all(Amenity)
-    return js([
-        storage.get(Amenity, id).to_dict()
-        for id in [
-            amenity[8:]
-            for amenity in amenities
-            ]
-        ])
+    return js_page(Amenity)
 
 
 @amenity_views.route('/amenities/<amenity_id>',
@@ -48,7 +41,7 @@ def get_single_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if not amenity:
         abort(404)
-    return js(amenity.to_dict())
+    return js_object(amenity)
 
 
 @amenity_views.route('/amenities/<amenity_id>',
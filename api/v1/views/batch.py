@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+
+"""
+Models for the routes of the batch_views
+"""
+
+
+from datetime import datetime
+from flask import request
+from hashlib import md5
+from json import dumps as js
+from api.v1.views import batch_views
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+# dictionary - <class name>: attributes a new object must have
+required = {"Amenity": ("name",), "City": ("state_id", "name"),
+            "Place": ("city_id", "user_id", "name"),
+            "Review": ("place_id", "user_id", "text"),
+            "State": ("name",), "User": ("email", "password")}
+# dictionary - foreign key: name of the class it refers to
+parents = {"city_id": "City", "place_id": "Place",
+           "state_id": "State", "user_id": "User"}
+# dictionary - <class name>: attributes an update leaves alone
+ignored = {"Amenity": (), "City": ("state_id",),
+           "Place": ("city_id", "user_id"),
+           "Review": ("place_id", "user_id"), "State": (),
+           "User": ("email",)}
+
+
+@batch_views.route('/batch', methods=['POST'], strict_slashes=False)
+def batch():
+    """
+    creates, updates and deletes many objects, given as
+    {"create": [...], "update": [...], "delete": [...]} where
+    each object names its class in "__class__", and saves
+    them all at once. Updates and deletes need the "id" of
+    their object. The parents of the new objects are checked
+    with one storage.existing() call per parent class.
+    Every object is built and assigned before any of them
+    reaches the storage, so nothing is changed unless every
+    object is valid.
+
+    Returns:
+      the ids of the objects created, updated and deleted,
+      or the error of the first invalid object and its index.
+    """
+    if not request.is_json:
+        return js({"error": "Not a JSON"}), 400
+
+    data = request.get_json()
+    if type(data) is not dict:
+        return js({"error": "Not a JSON"}), 400
+    ops = {op: data.get(op, []) for op in ("create", "update", "delete")}
+
+    for op, items in ops.items():
+        if type(items) is not list:
+            return js({"error": "Not a list", "op": op}), 400
+        for index, item in enumerate(items):
+            if (type(item) is not dict or
+                    type(item.get("__class__")) is not str or
+                    item["__class__"] not in classes):
+                return error("Missing __class__", op, index)
+            if op == "create":
+                names = required[item["__class__"]]
+            else:
+                names = ("id",)
+            for name in names:
+                if name not in item:
+                    return error("Missing " + name, op, index)
+            for name in ("id", "password") + tuple(parents):
+                if name in item and type(item[name]) is not str:
+                    return error("Invalid " + name, op, index)
+            if op != "delete":
+                cls = classes[item["__class__"]]
+                for name in item:
+                    if name != "__class__" and not settable(cls, name):
+                        return error("Invalid " + name, op, index)
+
+    # the objects to update or delete, by their position
+    targets = {}
+    for op in ("update", "delete"):
+        for index, item in enumerate(ops[op]):
+            obj = storage.get(item["__class__"], item["id"])
+            if obj is None:
+                return error("Not found", op, index, 404)
+            targets[(op, index)] = obj
+
+    # the parents the new objects refer to, and the ids they may have
+    wanted = {}
+    created = {}
+    for index, item in enumerate(ops["create"]):
+        for name, parent in parents.items():
+            if name in item:
+                wanted.setdefault(parent, set()).add(item[name])
+        if "id" in item:
+            ids = created.setdefault(item["__class__"], set())
+            if item["id"] in ids:
+                return error("Duplicate id", "create", index)
+            ids.add(item["id"])
+    taken = {name: storage.existing(name, ids)
+             for name, ids in created.items()}
+    for index, item in enumerate(ops["create"]):
+        if "id" in item and item["id"] in taken[item["__class__"]]:
+            return error("Already exists", "create", index, 409)
+    deleted = {}
+    for item in ops["delete"]:
+        deleted.setdefault(item["__class__"], set()).add(item["id"])
+    found = {parent: (storage.existing(parent, ids) |
+                      created.get(parent, set())) -
+             deleted.get(parent, set())
+             for parent, ids in wanted.items()}
+    for index, item in enumerate(ops["create"]):
+        for name, parent in parents.items():
+            if name in item and item[name] not in found[parent]:
+                return error("Not found", "create", index, 404)
+
+    instances = []
+    for index, item in enumerate(ops["create"]):
+        item = dict(item)
+        if item["__class__"] == "User":
+            item["password"] = md5(item["password"].encode()).hexdigest()
+        try:
+            instances.append(classes[item["__class__"]](**item))
+        except (TypeError, ValueError):
+            return error("Invalid object", "create", index)
+
+    now = datetime.utcnow()
+    for index, item in enumerate(ops["update"]):
+        obj = targets[("update", index)]
+        skip = ("__class__", "id", "created_at", "updated_at")
+        skip += ignored[item["__class__"]]
+        for key, value in item.items():
+            if key in skip:
+                continue
+            if key == "password" and item["__class__"] == "User":
+                value = md5(value.encode()).hexdigest()
+            setattr(obj, key, value)
+        obj.updated_at = now
+
+    done = {"create": [], "update": [], "delete": []}
+    for instance in instances:
+        storage.new(instance)
+        done["create"].append(instance.id)
+    for index in range(len(ops["update"])):
+        obj = targets[("update", index)]
+        storage.new(obj)
+        done["update"].append(obj.id)
+    for index in range(len(ops["delete"])):
+        obj = targets[("delete", index)]
+        storage.delete(obj)
+        done["delete"].append(obj.id)
+    storage.save()
+
+    return js(done), 200
+
+
+def settable(cls, name):
+    """
+    tells whether a batch may assign the attribute name of cls, which
+    must be one of its fields or not be defined by the class at all,
+    unlike properties, relationships and methods
+    """
+    if name.startswith("_"):
+        return False
+    if not hasattr(cls, name):
+        return True
+    table = getattr(cls, "__table__", None)
+    if table is not None:
+        return name in table.columns.keys()
+    return name in ("id", "created_at", "updated_at") or name in cls.defaults
+
+
+def error(message, op, index, status=400):
+    """returns the error of the object at index of op, and its status"""
+    return js({"error": message, "op": op, "index": index}), status
@@ -7,7 +7,7 @@ Models for the routes of the city_views
 
 from flask import abort, request
 from json import dumps as js
-from api.v1.views import city_views
+from api.v1.views import city_views, js_object, js_page
 from models import storage
 from models.city import City
 from models.state import State
@@ -22,7 +22,7 @@ def get_city_by_state(state_id):
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    return js([city.to_dict() for city in state.cities])
+    return js_page(City, State, state_id)
 
 
 @city_views.route('/cities/<city_id>',
@@ -35,7 +35,7 @@ def single_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return js(city.to_dict())
+    return js_object(city)
 
 
 @city_views.route('/cities/<city_id>',
@@ -27,13 +27,17 @@ def get_status():
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
 def stats():
     """
-    returns the number of objects stored in different classes.
+    returns the number of objects stored in different classes,
+    from the counts kept by the storage engine, or counted again
+    with ?exact=true.
     """
+    exact = request.args.get("exact", "").lower() in ("1", "true")
+    counts = storage.count_all(exact)
     return js({
-        "amenities": storage.count(Amenity),
-        "cities": storage.count(City),
-        "places": storage.count(Place),
-        "reviews": storage.count(Review),
-        "states": storage.count(State),
-        "users": storage.count(User)
+        "amenities": counts.get(Amenity.__name__, 0),
+        "cities": counts.get(City.__name__, 0),
+        "places": counts.get(Place.__name__, 0),
+        "reviews": counts.get(Review.__name__, 0),
+        "states": counts.get(State.__name__, 0),
+        "users": counts.get(User.__name__, 0)
         })
@@ -8,12 +8,16 @@ Models for the routes of the place_views
 
 from flask import abort, request
 from json import dumps as js
-from api.v1.views import place_views
+from api.v1.views import js_list, js_object, js_page, place_views
 from models import storage
 from models.city import City
 from models.user import User
 from models.place import Place
 
+# tuple - numeric fields of Place a search may give a range of
+ranged = ("number_rooms", "number_bathrooms", "max_guest",
+          "price_by_night", "latitude", "longitude")
+
 
 @place_views.route('cities/<city_id>/places',
                    methods=['GET'], strict_slashes=False)
@@ -24,14 +28,7 @@ def get_place_by_city(city_id):
     if not storage.get(City, city_id):
         abort(404)
 
-    places = storage.all(Place)
-
-    return js([
-        storage.get(Place, id).to_dict()
-        for id in [
-            place[6:] for place in places
-            ]
-        if storage.get(Place, id).to_dict()["city_id"] == city_id])
+    return js_page(Place, City, city_id)
 
 
 @place_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -42,7 +39,7 @@ def single_place(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    return js(place.to_dict())
+    return js_object(place)
 
 
 @place_views.route('/places/<place_id>',
@@ -121,3 +118,42 @@ def update_place(place_id):
 
     place.save()
     return js(place.to_dict()), 200
+
+
+@place_views.route('/places_search', methods=['POST'], strict_slashes=False)
+def search_places():
+    """
+    retrieves the places matching a JSON search such as
+    {"states": [...], "cities": [...], "amenities": [...],
+    "price_by_night": [low, high]}: the places of the given
+    states and cities, or of everywhere when neither is
+    given, which have every given amenity and whose numeric
+    fields lie in the given ranges, null for no bound.
+    """
+    if not request.is_json:
+        return js({"error": "Not a JSON"}), 400
+
+    data = request.get_json()
+    if type(data) is not dict:
+        return js({"error": "Not a JSON"}), 400
+
+    lists = {}
+    for name in ("states", "cities", "amenities"):
+        ids = data.get(name) or []
+        if (type(ids) is not list or
+                any(type(id) is not str for id in ids)):
+            return js({"error": "Invalid " + name}), 400
+        lists[name] = ids
+
+    ranges = {}
+    for field in ranged:
+        bounds = data.get(field)
+        if bounds is None:
+            continue
+        if (type(bounds) is not list or len(bounds) != 2 or
+                any(type(bound) not in (int, float, type(None))
+                    for bound in bounds)):
+            return js({"error": "Invalid " + field}), 400
+        ranges[field] = tuple(bounds)
+
+    return js_list(storage.search_places(**lists, **ranges))
@@ -7,8 +7,8 @@ Models for the routes of the amenity_place_views
 
 from flask import abort, request
 from json import dumps as js
-from api.v1.views import amenity_place_views
-from models import storage, storage_t
+from api.v1.views import amenity_place_views, js_list
+from models import storage
 from models.place import Place
 from models.amenity import Amenity
 from models.state import State
@@ -22,16 +22,11 @@ def get_amenity_by_place(place_id):
     Retrieves the amenities associated with a
     given place ID.
     """
-    if not storage.get(Place, place_id):
+    place = storage.get(Place, place_id)
+    if not place:
         abort(404)
 
-    if storage_t == "db":
-        return js([
-            i.to_dict()
-            for i in storage.get(Place, place_id).amenities
-            ])
-    else:
-        return storage.get(Place, place_id).amenities
+    return js_list(place.amenities)
 
 
 @amenity_place_views.route('places/<place_id>/amenities/<amenity_id>',
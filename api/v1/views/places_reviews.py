@@ -8,7 +8,7 @@ Models for the routes of the reviews_views
 
 from flask import abort, request
 from json import dumps as js
-from api.v1.views import review_views
+from api.v1.views import js_object, js_page, review_views
 from models import storage
 from models.place import Place
 from models.review import Review
@@ -24,12 +24,7 @@ def get_review_by_place(review_id):
     if not storage.get(Place, review_id):
         abort(404)
 
-    return js([
-        storage.get(Review, id).to_dict()
-        for id in [review[7:]
-                   for review in storage.all(Review)
-                   ]
-        if storage.get(Review, id).to_dict()["place_id"] == review_id])
+    return js_page(Review, Place, review_id)
 
 
 @review_views.route('/reviews/<review_id>',
@@ -42,7 +37,7 @@ def single_review(review_id):
     review = storage.get(Review, review_id)
     if not review:
         abort(404)
-    return js(review.to_dict())
+    return js_object(review)
 
 
 @review_views.route('/reviews/<review_id>',
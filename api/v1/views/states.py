@@ -7,7 +7,7 @@ Models for the routes of the state_views
 
 from flask import abort, request
 from json import dumps as js
-from api.v1.views import state_views
+from api.v1.views import js_object, js_page, state_views
 from models import storage
 from models.state import State
 
@@ -39,14 +39,7 @@ def get_all_state():
     Retrieves all instances of the `State` class from
     storage and returns them as a list of dictionaries.
     """
-    states = storage.all(State)
-    return js([
-        storage.get(State, id).to_dict()
-        for id in [
-            state[6:]
-            for state in states
-            ]
-        ])
+    return js_page(State)
 
 
 @state_views.route('/states/<state_id>',
@@ -59,7 +52,7 @@ def single_state(state_id):
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    return js(state.to_dict())
+    return js_object(state)
 
 
 @state_views.route('/states/<state_id>',
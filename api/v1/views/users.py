@@ -8,7 +8,7 @@ Models for the routes of the User_views
 from flask import abort, request
 from hashlib import md5
 from json import dumps as js
-from api.v1.views import user_views
+from api.v1.views import js_object, js_page, user_views
 from models import storage
 from models.user import User
 
@@ -20,14 +20,7 @@ def get_all_users():
     Retrieves all users from storage and returns a list
     of their dictionaries.
     """
-    users = storage.all(User)
-    return js([
-        storage.get(User, id).to_dict()
-        for id in [
-            user[5:]
-            for user in users
-            ]
-        ])
+    return js_page(User)
 
 
 @user_views.route('/users/<user_id>',
@@ -40,7 +33,7 @@ def get_single_user(user_id):
     user = storage.get(User, user_id)
     if not user:
         abort(404)
-    return js(user.to_dict())
+    return js_object(user)
 
 
 @user_views.route('/users/<user_id>',
@@ -4,6 +4,7 @@ Contains class BaseModel
 """
 
 from datetime import datetime
+from functools import lru_cache
 import models
 from os import getenv
 import sqlalchemy
@@ -13,6 +14,25 @@ import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+@lru_cache(maxsize=1024)
+def parse_time(string):
+    """
+    parses a datetime written in the time format, with the faster
+    fromisoformat() when string has its exact shape, since it also
+    accepts dates alone and UTC offsets, which the format does not
+    """
+    if (len(string) == 26 and string[10] == "T" and string[19] == "." and
+            string[20:].isdigit()):
+        return datetime.fromisoformat(string)
+    return datetime.strptime(string, time)
+
+
+def format_time(value):
+    """writes a datetime in the time format"""
+    return value.isoformat(timespec="microseconds")
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -21,10 +41,84 @@ else:
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # dictionary - values of the fields never set on an instance
+    defaults = {}
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    else:
+        # every field lives in a slot: id, created_at and updated_at here
+        # and the keys of defaults in subclasses. Other attributes go to
+        # the _extra dictionary. _dirty is True until the storage engine
+        # caches the serialized instance, and every assignment resets it.
+        __slots__ = ("__weakref__", "_dirty", "_extra",
+                     "id", "created_at", "updated_at")
+
+        def __setattr__(self, name, value):
+            """sets an attribute and flags the instance as changed"""
+            # slots and properties take the assignment themselves, other
+            # names go to _extra, even those of methods or class attributes
+            if hasattr(type(getattr(type(self), name, None)), "__set__"):
+                object.__setattr__(self, name, value)
+            else:
+                try:
+                    extra = object.__getattribute__(self, "_extra")
+                except AttributeError:
+                    extra = {}
+                    object.__setattr__(self, "_extra", extra)
+                extra[name] = value
+            if name != "_dirty":
+                object.__setattr__(self, "_dirty", True)
+                models.storage.touch(self, name)
+
+        def __getattr__(self, name):
+            """
+            returns an attribute stored outside the slots, or the default
+            of a field never set on the instance
+            """
+            try:
+                return object.__getattribute__(self, "_extra")[name]
+            except (AttributeError, KeyError):
+                pass
+            if name not in self.defaults:
+                raise AttributeError("'{}' object has no attribute '{}'".
+                                     format(self.__class__.__name__, name))
+            value = self.defaults[name]
+            if type(value) is list:
+                # a copy the instance may append to, stored without
+                # flagging it as changed since it only holds the default
+                value = list(value)
+                object.__setattr__(self, name, value)
+            return value
+
+        def __delattr__(self, name):
+            """deletes an attribute, from the slots or _extra"""
+            try:
+                object.__delattr__(self, name)
+            except AttributeError:
+                try:
+                    del object.__getattribute__(self, "_extra")[name]
+                except (AttributeError, KeyError):
+                    raise AttributeError(name)
+            object.__setattr__(self, "_dirty", True)
+            models.storage.touch(self, name)
+
+        @property
+        def __dict__(self):
+            """a new dictionary of the attributes set on the instance"""
+            attributes = {}
+            for name in ("id", "created_at", "updated_at") + tuple(
+                    self.defaults):
+                try:
+                    attributes[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+            try:
+                attributes.update(object.__getattribute__(self, "_extra"))
+            except AttributeError:
+                pass
+            return attributes
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -33,11 +127,11 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                self.updated_at = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -58,14 +152,23 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
+    def to_dict(self, fields=None):
+        """
+        returns a dictionary containing all keys/values of the instance,
+        or only those of the attributes named in fields
+        """
+        if fields is None:
+            new_dict = self.__dict__.copy()
+        else:
+            attributes = self.__dict__
+            new_dict = {name: attributes[name]
+                        for name in fields if name in attributes}
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = format_time(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
+            new_dict["updated_at"] = format_time(new_dict["updated_at"])
+        if fields is None or "__class__" in fields:
+            new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
         if getenv("HBNB_TYPE_STORAGE") == "db":
@@ -4,7 +4,7 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 
@@ -12,13 +12,16 @@ class City(BaseModel, Base):
     """Representation of city """
     if models.storage_t == "db":
         __tablename__ = 'cities'
+        __table_args__ = (Index("ix_cities_page", "created_at", "id"),
+                          Index("ix_cities_state_page", "state_id",
+                                "created_at", "id"))
         state_id = Column(String(60), ForeignKey('states.id'), nullable=False)
         name = Column(String(128), nullable=False)
         places = relationship("Place",
                               backref="cities", cascade="all, delete-orphan")
     else:
-        state_id = ""
-        name = ""
+        defaults = {"state_id": "", "name": ""}
+        __slots__ = tuple(defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes city"""
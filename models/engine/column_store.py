@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Contains the ColumnStore class
+"""
+
+from array import array
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+nan = float("nan")
+
+
+class ColumnStore:
+    """keeps numeric fields of the objects of one class in typed columns"""
+
+    def __init__(self, fields):
+        """
+        Instantiates an empty ColumnStore.
+
+        Args:
+          fields: names of the numeric fields to keep in columns.
+        """
+        self.fields = tuple(fields)
+        # dictionary - <class name>.id: row number
+        self.rows = {}
+        # list - key of each row, None for a free row
+        self.keys = []
+        # list - free row numbers to reuse
+        self.free = []
+        # dictionary - field name: array of float64, one value per row
+        self.columns = {field: array("d") for field in self.fields}
+
+    def __len__(self):
+        """returns the number of objects in the columns"""
+        return len(self.rows)
+
+    def set(self, key, obj):
+        """writes the fields of obj in the row of key"""
+        row = self.rows.get(key)
+        if row is None:
+            if self.free:
+                row = self.free.pop()
+                self.keys[row] = key
+            else:
+                row = len(self.keys)
+                self.keys.append(key)
+                for column in self.columns.values():
+                    column.append(nan)
+            self.rows[key] = row
+        for field in self.fields:
+            self.columns[field][row] = to_number(getattr(obj, field, None))
+
+    def update(self, key, field, value):
+        """writes value as field in the row of key, if key has one"""
+        row = self.rows.get(key)
+        if row is not None:
+            self.columns[field][row] = to_number(value)
+
+    def remove(self, key):
+        """frees the row of key"""
+        row = self.rows.pop(key, None)
+        if row is not None:
+            self.keys[row] = None
+            for column in self.columns.values():
+                column[row] = nan
+            self.free.append(row)
+
+    def select(self, ranges):
+        """
+        Finds the rows whose fields lie in ranges.
+
+        Args:
+          ranges: dictionary of field: (low, high), both bounds inclusive,
+            None for no bound.
+
+        Returns:
+          the list of keys of the matching rows
+        """
+        if numpy is not None:
+            mask = numpy.ones(len(self.keys), dtype=bool)
+            for field, (low, high) in ranges.items():
+                values = numpy.frombuffer(self.columns[field],
+                                          dtype=numpy.float64)
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+                # a NaN is in no range, even without bounds
+                mask &= values == values
+            rows = numpy.flatnonzero(mask).tolist()
+        else:
+            rows = range(len(self.keys))
+            for field, (low, high) in ranges.items():
+                values = self.columns[field]
+                low = float("-inf") if low is None else low
+                high = float("inf") if high is None else high
+                rows = [row for row in rows if low <= values[row] <= high]
+        keys = self.keys
+        return [keys[row] for row in rows if keys[row] is not None]
+
+
+def to_number(value):
+    """returns value as a float, or NaN when it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return nan
+
+
+def in_ranges(obj, ranges):
+    """tells whether the fields of obj lie in ranges, as select() does"""
+    for field, (low, high) in ranges.items():
+        value = to_number(getattr(obj, field, None))
+        if (value != value or
+                low is not None and value < low or
+                high is not None and value > high):
+            return False
+    return True
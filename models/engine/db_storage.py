@@ -13,17 +13,26 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, literal, or_, select
+from sqlalchemy import Column, Integer, MetaData, String, Table, union_all
+from sqlalchemy.orm import load_only, scoped_session, sessionmaker
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# table - one row per class, whose version every flush changing
+# objects of the class increments in the same transaction
+versions = Table("versions", MetaData(),
+                 Column("name", String(60), primary_key=True),
+                 Column("version", Integer, nullable=False, default=0))
 
 
 class DBStorage:
     """interacts with the MySQL database"""
     __engine = None
     __session = None
+    __batch = 0
+    # dictionary - <class name>: number of rows, kept by count_all()
+    __counts = None
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,6 +41,7 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
+        self.__batch = int(getenv('HBNB_DB_BATCH', 0))
         self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
@@ -39,6 +49,7 @@ class DBStorage:
                                              HBNB_MYSQL_DB))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+            versions.drop(self.__engine, checkfirst=True)
 
     def all(self, cls=None):
         """query on the current database session"""
@@ -56,9 +67,31 @@ class DBStorage:
         """add the object to the current database session"""
         self.__session.add(obj)
 
-    def save(self):
-        """commit all changes of the current database session"""
+    def save(self, wait=False):
+        """
+        commit all changes of the current database session.
+        With HBNB_DB_BATCH set, the changes are only flushed to the
+        database and committed every HBNB_DB_BATCH saves, or by sync()
+        and close() at the latest. The saves are counted per session,
+        so this only batches the saves of one script or console run:
+        the API commits every request, which sync()s its writes and
+        close()s its session.
+
+        Args:
+          wait: commit right away
+        """
+        if self.__batch and not wait:
+            self.__session.flush()
+            info = self.__session.info
+            info["unsaved"] = info.get("unsaved", 0) + 1
+            if info["unsaved"] < self.__batch:
+                return
+        self.sync()
+
+    def sync(self):
+        """commits the saves held back in the current database session"""
         self.__session.commit()
+        self.__session.info["unsaved"] = 0
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -68,12 +101,55 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
+        versions.create(self.__engine, checkfirst=True)
+        with self.__engine.begin() as connection:
+            names = set(connection.scalars(select(versions.c.name)))
+            missing = [{"name": name, "version": 0}
+                       for name in classes if name not in names]
+            if missing:
+                connection.execute(versions.insert(), missing)
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        event.listen(sess_factory, "after_flush", self.__after_flush)
+        event.listen(sess_factory, "after_commit", self.__after_commit)
+        event.listen(sess_factory, "after_rollback", self.__after_rollback)
         Session = scoped_session(sess_factory)
         self.__session = Session
+        self.__counts = None
+
+    def __after_flush(self, session, flush_context):
+        """
+        notes the rows a flush inserted and deleted, class by class,
+        and increments the versions of the classes it changed
+        """
+        changes = session.info.setdefault("count_changes", {})
+        for objs, change in ((session.new, 1), (session.deleted, -1)):
+            for obj in objs:
+                name = obj.__class__.__name__
+                changes[name] = changes.get(name, 0) + change
+        changed = {obj.__class__.__name__ for objs in
+                   (session.new, session.dirty, session.deleted)
+                   for obj in objs}
+        for name in sorted(changed & set(classes)):
+            session.connection().execute(
+                versions.update().where(versions.c.name == name).values(
+                    version=versions.c.version + 1))
+
+    def __after_commit(self, session):
+        """applies the row changes of a commit to the kept counts"""
+        changes = session.info.pop("count_changes", {})
+        if self.__counts is not None:
+            for name, change in changes.items():
+                if name in self.__counts:
+                    self.__counts[name] += change
+
+    def __after_rollback(self, session):
+        """forgets the row changes of a rolled back transaction"""
+        session.info.pop("count_changes", None)
 
     def close(self):
         """call remove() method on the private session attribute"""
+        if self.__session.info.get("unsaved"):
+            self.sync()
         self.__session.close()
 
     def get(self, cls, id):
@@ -89,10 +165,34 @@ class DBStorage:
           The instance with the specified id is being
           returned.
         """
-        instances = self.all(cls)
-        ins = instances.pop("{}.{}".
-                            format(cls.__name__, id), None)
-        return ins
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls not in classes.values() or id is None:
+            return None
+        return self.__session.get(cls, id)
+
+    def existing(self, cls, ids, chunk_size=1000):
+        """
+        Tells which ids are those of stored instances of
+        a class, with one primary key IN query per chunk
+        of chunk_size ids.
+
+        Args:
+          cls: class of the instances.
+          ids: unique identifiers to look for.
+
+        Returns:
+          the set of the ids found
+        """
+        if type(cls) is str:
+            cls = classes.get(cls)
+        ids = list(ids)
+        found = set()
+        for start in range(0, len(ids), chunk_size):
+            query = select(cls.id).where(
+                cls.id.in_(ids[start:start + chunk_size]))
+            found.update(self.__session.execute(query).scalars())
+        return found
 
     def count(self, cls=None):
         """
@@ -108,5 +208,181 @@ class DBStorage:
           else returns length of the cls classes
         """
         if cls:
-            return len(self.all(cls))
-        return len(self.all())
+            if type(cls) is str:
+                cls = classes.get(cls)
+            if cls not in classes.values():
+                return 0
+            return self.__session.query(func.count(cls.id)).scalar()
+        return sum(self.count_all(exact=True).values())
+
+    def children(self, parent_cls, parent_id, child_cls):
+        """
+        Retrieves the instances of a class that belong
+        to a parent through their foreign key, such as
+        the cities of a state (City.state_id).
+
+        Args:
+          parent_cls: class of the parent.
+          parent_id: unique identifier of the parent.
+          child_cls: class of the children to retrieve.
+
+        Returns:
+          a dictionary of <class name>.id: object
+        """
+        if type(parent_cls) is not str:
+            parent_cls = parent_cls.__name__
+        if type(child_cls) is str:
+            child_cls = classes.get(child_cls)
+        fk = getattr(child_cls, parent_cls.lower() + "_id")
+        query = self.__session.query(child_cls).filter(fk == parent_id)
+        return {"{}.{}".format(child_cls.__name__, obj.id): obj
+                for obj in query}
+
+    def page(self, cls, limit=None, after=None, parent_cls=None,
+             parent_id=None, fields=None):
+        """
+        Retrieves the instances of a class in (created_at, id)
+        order, starting after a given one, with a keyset
+        WHERE clause rather than an OFFSET.
+
+        Args:
+          cls: class of objects to retrieve.
+          limit: maximum number of objects, None for all.
+          after: (created_at, id) of the last object of the
+            previous page, None for the first page.
+          parent_cls: only retrieve the children of the parent
+            of this class and parent_id, as children() does.
+          parent_id: unique identifier of the parent.
+          fields: names of the attributes the caller reads, None
+            for all.
+            Only their columns are SELECTed.
+
+        Returns:
+          a list of objects
+        """
+        if type(cls) is str:
+            cls = classes.get(cls)
+        query = self.__session.query(cls)
+        if parent_cls is not None:
+            if type(parent_cls) is not str:
+                parent_cls = parent_cls.__name__
+            fk = getattr(cls, parent_cls.lower() + "_id")
+            query = query.filter(fk == parent_id)
+        if after is not None:
+            created_at, id = after
+            query = query.filter(or_(
+                cls.created_at > created_at,
+                and_(cls.created_at == created_at, cls.id > id)))
+        if fields is not None:
+            columns = cls.__table__.columns
+            query = query.options(load_only(*[
+                getattr(cls, name)
+                for name in set(fields) | {"id", "created_at"}
+                if name in columns]))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def generation(self, cls, parent_cls=None, parent_id=None):
+        """
+        Tells the version of the objects of a class, from
+        the row of the class in the versions table, which
+        every commit changing them increments. The children
+        of a parent share the version of their class.
+
+        Args:
+          cls: class of the objects.
+          parent_cls: class of the parent, unused.
+          parent_id: unique identifier of the parent, unused.
+
+        Returns:
+          a value that differs after any change of those objects
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        return self.__session.execute(
+            select(versions.c.version).where(versions.c.name == cls)
+        ).scalar_one()
+
+    def filter(self, cls, **ranges):
+        """
+        Retrieves the objects of a class whose numeric
+        fields lie in the given ranges, with a WHERE clause.
+
+        Args:
+          cls: class of objects to filter.
+          ranges: field=(low, high) bounds, both inclusive,
+            None for no bound.
+
+        Returns:
+          a dictionary of <class name>.id: object
+        """
+        if type(cls) is str:
+            cls = classes.get(cls)
+        query = self.__in_ranges(self.__session.query(cls), cls, ranges)
+        return {"{}.{}".format(cls.__name__, obj.id): obj for obj in query}
+
+    def __in_ranges(self, query, cls, ranges):
+        """adds the WHERE clauses of field=(low, high) ranges to query"""
+        for field, (low, high) in ranges.items():
+            column = getattr(cls, field)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return query
+
+    def search_places(self, states=(), cities=(), amenities=(), **ranges):
+        """
+        Retrieves the places of some states or cities that
+        have every given amenity, in a single query joining
+        the cities of the places and counting their rows in
+        place_amenity.
+
+        Args:
+          states: ids of states, whose cities' places match.
+          cities: ids of cities, whose places match too.
+            Every place matches when neither is given.
+          amenities: ids of amenities a place must all have.
+          ranges: field=(low, high) bounds, as filter() takes.
+
+        Returns:
+          a list of places
+        """
+        query = self.__session.query(Place)
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(Place.city_id.in_(set(cities)),
+                    City.state_id.in_(set(states))))
+        amenities = set(amenities)
+        if amenities:
+            place_amenity = Base.metadata.tables["place_amenity"]
+            query = query.filter(Place.id.in_(
+                select(place_amenity.c.place_id)
+                .where(place_amenity.c.amenity_id.in_(amenities))
+                .group_by(place_amenity.c.place_id)
+                .having(func.count() == len(amenities))))
+        return self.__in_ranges(query, Place, ranges).all()
+
+    def count_all(self, exact=False):
+        """
+        Counts the objects of every class, from counts kept up
+        to date by the commits of this process. They are taken
+        in a single query the first time, or when exact is set
+        to see the rows written by other processes too.
+
+        Args:
+          exact: count the rows in the database again.
+
+        Returns:
+          a dictionary of <class name>: number of objects
+        """
+        if exact or self.__counts is None:
+            query = union_all(*[
+                select(literal(name).label("name"),
+                       func.count(classes[name].id))
+                for name in classes
+                ])
+            self.__counts = dict(self.__session.execute(query).all())
+        return dict(self.__counts)
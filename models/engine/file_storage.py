@@ -3,10 +3,20 @@
 Contains the FileStorage class
 """
 
+from copy import deepcopy
+from itertools import chain
 import json
+import re
+from os import O_RDONLY, fsync, getenv, getpid, path, remove, replace, stat
+from os import close as close_fd, open as open_fd
+from threading import Condition, RLock, Timer
+from time import monotonic
+from uuid import uuid4
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.column_store import ColumnStore, in_ranges
+from models.engine.sorted_index import SortedIndex
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -15,59 +25,636 @@ from models.user import User
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+numeric_fields = {"Place": ("number_rooms", "number_bathrooms", "max_guest",
+                            "price_by_night", "latitude", "longitude")}
+foreign_keys = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+                "Review": ("place_id", "user_id")}
+whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def mutable_values(obj):
+    """
+    returns copies of the list and dictionary attributes of obj, which
+    change in place without flagging obj, unset list fields being []
+    """
+    values = {}
+    for name, default in obj.defaults.items():
+        if type(default) is list:
+            try:
+                values[name] = list(object.__getattribute__(obj, name))
+            except AttributeError:
+                values[name] = []
+    try:
+        extra = object.__getattribute__(obj, "_extra")
+    except AttributeError:
+        extra = {}
+    for name, value in extra.items():
+        if type(value) in (list, dict):
+            values[name] = deepcopy(value)
+    return values
+
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # string - path to the journal of changes made since the JSON file
+    __journal_path = __file_path + ".log"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects grouped by <class name>
+    __by_class = {}
+    # dictionary - <class name>: {<class name>.id: JSON string} of the
+    # records not instantiated yet in lazy mode
+    __raw = {}
+    # dictionary - (<class name>, foreign key): {parent id: {key: object}}
+    __children = {}
+    # dictionary - (<class name>, foreign key): {key: parent id}
+    __parent_ids = {}
+    # dictionary - <class name>.id: (object, JSON string of its to_dict(),
+    # its mutable_values() then)
+    __cache = {}
+    # dictionary - <class name> or (<class name>, foreign key, parent id):
+    # number of changes made by new(), delete() and foreign key updates
+    __generations = {}
+    # int - number of reload() calls, any of which may change any object
+    __epoch = 0
+    # string - new in every process, as each one has its own objects
+    __process = uuid4().hex
+    # set - keys of the objects added, assigned to or deleted since the
+    # last flush()
+    __pending = set()
+    # int - number of entries currently in the journal
+    __journal_len = 0
+    # int - sequence number of the last journal entry written or read. In
+    # journal mode the JSON file holds the one it covers under "__seq__",
+    # so that entries left by a compaction cut short are not replayed.
+    __seq = 0
+    # tuple - (inode, size, mtime) of the JSON file and the journal
+    __stamp = None
+    # string - "always" reloads on close(), "changed" only if the file moved
+    __reload_mode = getenv("HBNB_FILE_RELOAD", "changed")
+    # bool - append changes to the journal instead of rewriting the file
+    __journal = getenv("HBNB_FILE_JOURNAL") == "on"
+    # bool - only instantiate the records read from the file when used
+    __lazy = getenv("HBNB_FILE_LAZY") == "on"
+    # bool - answer filter() from typed columns of the numeric fields
+    __columnar = getenv("HBNB_FILE_COLUMNS") == "on"
+    # dictionary - <class name>: ColumnStore, built by the first filter()
+    __columns = {}
+    # dictionary - <class name>: SortedIndex, built by the first page()
+    __orders = {}
+    # dictionary - amenity id: {<Place key>: place listing it in its
+    # amenity_ids}, built by the first search_places() with amenities
+    __by_amenity = None
+    # dictionary - <Place key>: amenity ids it is indexed under
+    __amenity_ids = {}
+    # int - journal entries after which save() rewrites the JSON file
+    __compact_at = int(getenv("HBNB_FILE_COMPACT", 1000))
+    # string - "always", "batch" or "never" fsync the written files
+    __fsync = getenv("HBNB_FILE_FSYNC", "batch")
+    # float - seconds between two fsyncs in "batch" mode
+    __fsync_interval = float(getenv("HBNB_FILE_FSYNC_INTERVAL", 1))
+    # float - monotonic time of the last fsync
+    __synced_at = 0.0
+    # Timer - fsync of the journal appends "batch" mode put off
+    __sync_timer = None
+    # float - seconds a save() may wait to be written with the next ones
+    __coalesce = float(getenv("HBNB_FILE_COALESCE_MS", 0)) / 1000
+    # int - held back saves after which they are written right away
+    __coalesce_max = int(getenv("HBNB_FILE_COALESCE_MAX", 100))
+    # int - number of save() calls made, and written to the file
+    __saves = 0
+    __flushed = 0
+    # tuple - (last save covered, exception) of the last failed write,
+    # None once a write succeeds
+    __failed = None
+    # Timer - scheduled write of the held back saves
+    __timer = None
+    # Condition - serializes writers and wakes up those waiting on a write
+    __lock = Condition(RLock())
 
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """returns the dictionary __objects, or only the objects of cls"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            if type(cls) is not str:
+                cls = cls.__name__
+            self.__hydrate(cls)
+            return dict(self.__by_class.get(cls, {}))
+        for name in list(self.__raw):
+            self.__hydrate(name)
         return self.__objects
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock:
+                self.__put(key, obj)
+                self.__pending.add(key)
+                self.__changed(obj)
+
+    def save(self, wait=False):
+        """
+        serializes __objects to the JSON file (path: __file_path).
+        With HBNB_FILE_COALESCE_MS set, the write is held back for that
+        long, or until HBNB_FILE_COALESCE_MAX saves are held back, so that
+        a burst of saves is written once.
+
+        Args:
+          wait: block until the write covering this save is done
+        """
+        with self.__lock:
+            FileStorage.__saves += 1
+            ticket = self.__saves
+            if (not self.__coalesce or
+                    ticket - self.__flushed >= self.__coalesce_max):
+                self.flush()
+            elif self.__timer is None:
+                FileStorage.__timer = Timer(self.__coalesce, self.flush)
+                self.__timer.start()
+        if wait:
+            self.sync(ticket)
+
+    def sync(self, ticket=None):
+        """
+        blocks until the held back saves are written to the file, or
+        raises the exception of the write that failed to cover them
+
+        Args:
+          ticket: only wait for the saves up to this one
+        """
+        with self.__lock:
+            if ticket is None:
+                ticket = self.__saves
+            while self.__flushed < ticket:
+                if self.__failed is not None and self.__failed[0] >= ticket:
+                    raise self.__failed[1]
+                self.__lock.wait()
+
+    def flush(self):
+        """
+        writes the held back saves: in journal mode appends the pending
+        changes to __journal_path until the journal holds
+        HBNB_FILE_COMPACT entries, otherwise rewrites the JSON file
+        """
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                FileStorage.__timer = None
+            ticket = self.__saves
+            try:
+                if (self.__journal and self.__journal_len +
+                        len(self.__pending) < self.__compact_at):
+                    self.__append_journal()
+                else:
+                    self.__write_snapshot()
+            except BaseException as e:
+                # the saves stay pending for the next flush
+                FileStorage.__failed = (ticket, e)
+                self.__lock.notify_all()
+                raise
+            self.__pending.clear()
+            FileStorage.__stamp = self.__file_stamp()
+            FileStorage.__flushed = ticket
+            FileStorage.__failed = None
+            self.__lock.notify_all()
+
+    def __write_snapshot(self):
+        """
+        writes every object to a temporary file renamed over the JSON
+        file, so readers never see a partial write, and empties the journal
+        """
+        tmp_path = "{}.{}.tmp".format(self.__file_path, getpid())
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write("{")
+                header = []
+                if self.__journal:
+                    header.append(("__seq__", str(self.__seq)))
+                entries = chain(
+                    header,
+                    ((key, self.__serialize(key, obj))
+                     for key, obj in self.__objects.items()),
+                    (entry for raw in self.__raw.values()
+                     for entry in raw.items()))
+                f.writelines(
+                    "{}\n{}: {}".format("," if i else "", json.dumps(key),
+                                        string)
+                    for i, (key, string) in enumerate(entries))
+                f.write("\n}")
+                self.__sync(f, defer=False)
+            replace(tmp_path, self.__file_path)
+            self.__sync_dir()
+        except BaseException:
+            if path.exists(tmp_path):
+                remove(tmp_path)
+            raise
+        if path.exists(self.__journal_path):
+            remove(self.__journal_path)
+        FileStorage.__journal_len = 0
+
+    def __append_journal(self):
+        """appends one JSON line per pending change to the journal"""
+        lines = []
+        seq = self.__seq
+        for key in self.__pending:
+            obj = self.__objects.get(key)
+            seq += 1
+            lines.append('{{"seq": {}, "key": {}, "obj": {}}}\n'.format(
+                seq, json.dumps(key),
+                self.__serialize(key, obj) if obj is not None else "null"))
+        with open(self.__journal_path, 'a') as f:
+            f.writelines(lines)
+            self.__sync(f)
+        FileStorage.__seq = seq
+        FileStorage.__journal_len += len(lines)
+
+    def __serialize(self, key, obj):
+        """
+        returns the JSON string of obj.to_dict(), reusing the cached one
+        while obj is unchanged since it was last serialized or loaded:
+        not assigned to, and its lists not changed in place either
+        """
+        cached = self.__cache.get(key)
+        if (cached is not None and cached[0] is obj and
+                not getattr(obj, "_dirty", True) and
+                mutable_values(obj) == cached[2]):
+            return cached[1]
+        # cleared first, so that an assignment made while to_dict() runs
+        # flags obj again rather than being lost with the flag
+        obj._dirty = False
+        values = mutable_values(obj)
+        string = json.dumps(obj.to_dict())
+        self.__cache[key] = (obj, string, values)
+        return string
+
+    def __sync(self, f, defer=True):
+        """
+        flushes f to disk as the HBNB_FILE_FSYNC policy requires. In
+        "batch" mode an fsync due sooner than the interval allows is
+        put off to the end of it, unless defer is False, as for the
+        files renamed over the JSON file, which must be on disk first.
+        """
+        if self.__fsync == "never":
+            return
+        f.flush()
+        wait = self.__synced_at + self.__fsync_interval - monotonic()
+        if self.__fsync == "batch" and defer and wait > 0:
+            if self.__sync_timer is None:
+                FileStorage.__sync_timer = Timer(wait, self.__sync_journal)
+                self.__sync_timer.start()
+            return
+        fsync(f.fileno())
+        FileStorage.__synced_at = monotonic()
+
+    def __sync_dir(self):
+        """
+        fsyncs the directory of the JSON file, so that the rename of a
+        snapshot over it survives a power loss, unless HBNB_FILE_FSYNC
+        is "never"
+        """
+        if self.__fsync == "never":
+            return
+        fd = open_fd(path.dirname(path.abspath(self.__file_path)), O_RDONLY)
+        try:
+            fsync(fd)
+        finally:
+            close_fd(fd)
 
-    def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+    def __sync_journal(self):
+        """fsyncs the journal appends put off by __sync()"""
+        with self.__lock:
+            FileStorage.__sync_timer = None
+            try:
+                with open(self.__journal_path, 'rb') as f:
+                    fsync(f.fileno())
+            except OSError:
+                # compacted since, by a snapshot that was fsynced
+                return
+            FileStorage.__synced_at = monotonic()
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """
+        deserializes the JSON file and replays the journal to __objects,
+        except the objects of the saves not written yet
+        """
+        with self.__lock:
+            FileStorage.__stamp = self.__file_stamp()
+            FileStorage.__epoch += 1
+            covered = 0
+            try:
+                with open(self.__file_path, 'r') as f:
+                    for key, record, string in self.__iter_records(f):
+                        if key == "__seq__":
+                            covered = record
+                        else:
+                            self.__load(key, record, string)
+            except Exception:
+                pass
+            FileStorage.__seq = covered
+            self.__replay_journal(covered)
+
+    def __iter_records(self, f, chunk_size=1 << 16):
+        """
+        yields the (key, value, JSON string of value) triples of the JSON
+        object in f one at a time, reading f by chunks instead of parsing
+        it as a whole
+        """
+        decoder = json.JSONDecoder()
+        buf = ""
+        pos = 0
+        expect = "{"
+        while True:
+            pos = whitespace.match(buf, pos).end()
+            if pos < len(buf):
+                char = buf[pos]
+                if expect in "{:":
+                    if char != expect:
+                        raise ValueError("expected '{}'".format(expect))
+                    pos += 1
+                    expect = "key" if expect == "{" else "value"
+                    continue
+                if expect in ",key" and char == "}":
+                    return
+                if expect == ",":
+                    if char != ",":
+                        raise ValueError("expected ','")
+                    pos += 1
+                    expect = "key"
+                    continue
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    # the value goes on in the next chunk
+                    pass
+                else:
+                    start, pos = pos, end
+                    if expect == "value":
+                        yield key, value, buf[start:end]
+                        expect = ","
+                    else:
+                        key = value
+                        expect = ":"
+                    continue
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("unexpected end of the JSON file")
+            buf = buf[pos:] + chunk
+            pos = 0
+
+    def __replay_journal(self, covered=0):
+        """
+        applies the journal entries on top of the loaded JSON file,
+        but those with a sequence number up to covered, which it holds
+        """
+        FileStorage.__journal_len = 0
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
+            with open(self.__journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # torn write at the end of the journal: compact it
+                        # on the next save rather than appending after it
+                        FileStorage.__journal_len = self.__compact_at
+                        break
+                    seq = entry.get("seq")
+                    if seq is not None:
+                        FileStorage.__seq = max(self.__seq, seq)
+                    if (entry["key"] in self.__pending or
+                            seq is not None and seq <= covered):
+                        pass
+                    elif entry["obj"] is None:
+                        self.__drop(entry["key"])
+                    else:
+                        self.__load(entry["key"], entry["obj"])
+                    FileStorage.__journal_len += 1
+        except OSError:
             pass
 
+    def __load(self, key, record, string=None):
+        """
+        instantiates record, as read from the JSON file, under key and
+        caches string as its serialized form when it is complete.
+        In lazy mode only string is kept until the object is used.
+        Objects added or deleted since the last write are left alone,
+        as the file is older than them until the next flush.
+        """
+        if key in self.__pending:
+            return
+        if string is None:
+            string = json.dumps(record)
+        if self.__lazy:
+            self.__drop(key)
+            self.__raw.setdefault(record["__class__"], {})[key] = string
+            return
+        obj = classes[record["__class__"]](**record)
+        self.__put(key, obj)
+        if ("id" in record and "created_at" in record and
+                "updated_at" in record):
+            self.__cache[key] = (obj, string, mutable_values(obj))
+            obj._dirty = False
+
+    def __hydrate(self, name, key=None):
+        """
+        instantiates the records of class name kept by lazy mode, or only
+        the one under key
+
+        Returns:
+          the object under key, or None
+        """
+        raw = self.__raw.get(name)
+        if not raw:
+            return None
+        with self.__lock:
+            if key is None:
+                keys = list(raw)
+            elif key in raw:
+                keys = [key]
+            else:
+                return None
+            for k in keys:
+                string = raw.pop(k)
+                record = json.loads(string)
+                obj = classes[record["__class__"]](**record)
+                self.__put(k, obj)
+                self.__cache[k] = (obj, string, mutable_values(obj))
+                obj._dirty = False
+        return self.__objects.get(key)
+
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock:
+                if key in self.__objects:
+                    self.__drop(key)
+                    self.__pending.add(key)
+                    self.__changed(obj)
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and its class group"""
+        name = obj.__class__.__name__
+        if self.__raw:
+            self.__raw.get(name, {}).pop(key, None)
+        if self.__objects.get(key) is not obj:
+            for fk in foreign_keys.get(name, ()):
+                self.__unlink(key, name, fk)
+                self.__link(key, obj, fk)
+        self.__objects[key] = obj
+        self.__by_class.setdefault(name, {})[key] = obj
+        if name in self.__columns:
+            self.__columns[name].set(key, obj)
+        if name in self.__orders:
+            self.__orders[name].set(key, obj)
+        if name == "Place" and self.__by_amenity is not None:
+            self.__index_amenities(key, obj)
+
+    def __drop(self, key):
+        """removes key from __objects and its class group"""
+        obj = self.__objects.pop(key, None)
+        self.__cache.pop(key, None)
+        if self.__raw:
+            self.__raw.get(key.split(".")[0], {}).pop(key, None)
+        if obj is not None:
+            name = obj.__class__.__name__
+            self.__by_class.get(name, {}).pop(key, None)
+            for fk in foreign_keys.get(name, ()):
+                self.__unlink(key, name, fk)
+            if name in self.__columns:
+                self.__columns[name].remove(key)
+            if name in self.__orders:
+                self.__orders[name].remove(key)
+            if name == "Place" and self.__by_amenity is not None:
+                self.__index_amenities(key, None)
+
+    def __index_amenities(self, key, obj):
+        """
+        indexes the place obj under key by the ids in its amenity_ids,
+        in place of those it was indexed by, or only unindexes key when
+        obj is None
+        """
+        for amenity_id in self.__amenity_ids.pop(key, ()):
+            places = self.__by_amenity[amenity_id]
+            places.pop(key, None)
+            if not places:
+                del self.__by_amenity[amenity_id]
+        if obj is None:
+            return
+        amenity_ids = set(getattr(obj, "amenity_ids", None) or ())
+        for amenity_id in amenity_ids:
+            self.__by_amenity.setdefault(amenity_id, {})[key] = obj
+        self.__amenity_ids[key] = amenity_ids
+
+    def __link(self, key, obj, fk):
+        """adds obj under key to the children of its parent through fk"""
+        name = obj.__class__.__name__
+        parent_id = getattr(obj, fk, None)
+        self.__children.setdefault((name, fk), {}).setdefault(
+            parent_id, {})[key] = obj
+        self.__parent_ids.setdefault((name, fk), {})[key] = parent_id
+
+    def __unlink(self, key, name, fk):
+        """removes key from the children of its parent through fk"""
+        parent_ids = self.__parent_ids.get((name, fk), {})
+        if key not in parent_ids:
+            return
+        parent_id = parent_ids.pop(key)
+        children = self.__children[(name, fk)]
+        children[parent_id].pop(key, None)
+        if not children[parent_id]:
+            del children[parent_id]
+
+    def __changed(self, obj):
+        """counts a change of obj in its class and its parents"""
+        name = obj.__class__.__name__
+        self.__count(name)
+        for fk in foreign_keys.get(name, ()):
+            self.__count((name, fk, getattr(obj, fk, None)))
+
+    def __count(self, key):
+        """adds one to the generation of key"""
+        self.__generations[key] = self.__generations.get(key, 0) + 1
+
+    def generation(self, cls, parent_cls=None, parent_id=None):
+        """
+        Tells the version of the objects of a class, or of
+        the children of a parent, from counters kept on every
+        change, without looking at the objects.
+
+        Args:
+          cls: class of the objects.
+          parent_cls: only consider the children of the parent
+            of this class and parent_id, as children() does.
+          parent_id: unique identifier of the parent.
+
+        Returns:
+          a value that differs after any change of those objects,
+          and between processes
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        key = cls
+        if parent_cls is not None:
+            if type(parent_cls) is not str:
+                parent_cls = parent_cls.__name__
+            fk = parent_cls.lower() + "_id"
+            if fk in foreign_keys.get(cls, ()):
+                key = (cls, fk, parent_id)
+        return (self.__process, getpid(), self.__epoch,
+                self.__generations.get(key, 0))
+
+    def touch(self, obj, name):
+        """
+        keeps the indexes of obj in step after its attribute name was
+        assigned, which BaseModel reports on every assignment, and marks
+        obj as changed for the next flush, which only journals those
+        """
+        cls = obj.__class__.__name__
+        key = "{}.{}".format(cls, getattr(obj, "id", None))
+        if self.__objects.get(key) is not obj:
+            return
+        columns = self.__columns.get(cls)
+        linked = name in foreign_keys.get(cls, ())
+        ordered = name == "created_at" and cls in self.__orders
+        listed = name == "amenity_ids" and self.__by_amenity is not None
+        with self.__lock:
+            self.__pending.add(key)
+            if linked:
+                old_id = self.__parent_ids.get((cls, name), {}).get(key)
+                self.__unlink(key, cls, name)
+                self.__link(key, obj, name)
+                self.__count((cls, name, old_id))
+                self.__count((cls, name, getattr(obj, name, None)))
+            if columns is not None and name in columns.fields:
+                columns.update(key, name, getattr(obj, name))
+            if ordered:
+                self.__orders[cls].set(key, obj)
+            if listed:
+                self.__index_amenities(key, obj)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """
+        call reload() method for deserializing the JSON file to objects,
+        skipping it when the file is unchanged since it was last read or
+        written by this process (unless HBNB_FILE_RELOAD is "always")
+        """
+        if (self.__reload_mode == "always" or
+                self.__file_stamp() != self.__stamp):
+            self.reload()
+
+    def __file_stamp(self):
+        """returns the (inode, size, mtime) of the JSON file and journal"""
+        stamp = ()
+        for file_path in (self.__file_path, self.__journal_path):
+            try:
+                st = stat(file_path)
+                stamp += ((st.st_ino, st.st_size, st.st_mtime_ns),)
+            except OSError:
+                stamp += (None,)
+        return stamp
 
     def get(self, cls, id):
         """
@@ -82,11 +669,35 @@ class FileStorage:
           The instance with the specified id is being
           returned.
         """
-        instances = self.all(cls)
-        i = instances.pop("{}.{}".
-                          format(cls.__name__, id), None)
+        if type(cls) is not str:
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        obj = self.__objects.get(key)
+        if obj is None and self.__raw:
+            obj = self.__hydrate(cls, key)
+        return obj
 
-        return i
+    def existing(self, cls, ids):
+        """
+        Tells which ids are those of stored instances of
+        a class, with one lookup per id.
+
+        Args:
+          cls: class of the instances.
+          ids: unique identifiers to look for.
+
+        Returns:
+          the set of the ids found
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        raw = self.__raw.get(cls, {})
+        found = set()
+        for id in ids:
+            key = "{}.{}".format(cls, id)
+            if key in self.__objects or key in raw:
+                found.add(id)
+        return found
 
     def count(self, cls=None):
         """
@@ -102,5 +713,177 @@ class FileStorage:
           else returns length of the cls classes
         """
         if cls:
-            return len(self.all(cls))
-        return len(self.all())
+            if type(cls) is not str:
+                cls = cls.__name__
+            return (len(self.__by_class.get(cls, {})) +
+                    len(self.__raw.get(cls, {})))
+        return len(self.__objects) + sum(map(len, self.__raw.values()))
+
+    def children(self, parent_cls, parent_id, child_cls):
+        """
+        Retrieves the instances of a class that belong
+        to a parent through their foreign key, such as
+        the cities of a state (City.state_id).
+
+        Args:
+          parent_cls: class of the parent.
+          parent_id: unique identifier of the parent.
+          child_cls: class of the children to retrieve.
+
+        Returns:
+          a dictionary of <class name>.id: object
+        """
+        if type(parent_cls) is not str:
+            parent_cls = parent_cls.__name__
+        if type(child_cls) is not str:
+            child_cls = child_cls.__name__
+        fk = parent_cls.lower() + "_id"
+        self.__hydrate(child_cls)
+        if fk in foreign_keys.get(child_cls, ()):
+            return dict(self.__children.get((child_cls, fk), {}).get(
+                parent_id, {}))
+        return {key: obj
+                for key, obj in self.__by_class.get(child_cls, {}).items()
+                if getattr(obj, fk, None) == parent_id}
+
+    def page(self, cls, limit=None, after=None, parent_cls=None,
+             parent_id=None, fields=None):
+        """
+        Retrieves the instances of a class in (created_at, id)
+        order, starting after a given one, so that a page is
+        found without going through the previous ones.
+
+        Args:
+          cls: class of objects to retrieve.
+          limit: maximum number of objects, None for all.
+          after: (created_at, id) of the last object of the
+            previous page, None for the first page.
+          parent_cls: only retrieve the children of the parent
+            of this class and parent_id, as children() does.
+          parent_id: unique identifier of the parent.
+          fields: names of the attributes the caller reads, None
+            for all.
+            Unused, the objects are in memory already.
+
+        Returns:
+          a list of objects
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        if parent_cls is not None:
+            objs = self.children(parent_cls, parent_id, cls)
+            index = SortedIndex(objs)
+        else:
+            self.__hydrate(cls)
+        with self.__lock:
+            if parent_cls is None:
+                objs = self.__by_class.get(cls, {})
+                if cls not in self.__orders:
+                    self.__orders[cls] = SortedIndex(objs)
+                index = self.__orders[cls]
+            keys = ("{}.{}".format(cls, id)
+                    for created_at, id in index.after(after, limit))
+            return [objs[key] for key in keys if key in objs]
+
+    def filter(self, cls, **ranges):
+        """
+        Retrieves the objects of a class whose numeric
+        fields lie in the given ranges.
+
+        Args:
+          cls: class of objects to filter.
+          ranges: field=(low, high) bounds, both inclusive,
+            None for no bound.
+
+        Returns:
+          a dictionary of <class name>.id: object
+        """
+        if type(cls) is not str:
+            cls = cls.__name__
+        self.__hydrate(cls)
+        with self.__lock:
+            if (self.__columnar and cls not in self.__columns and
+                    cls in numeric_fields):
+                columns = ColumnStore(numeric_fields[cls])
+                for key, obj in self.__by_class.get(cls, {}).items():
+                    columns.set(key, obj)
+                self.__columns[cls] = columns
+            columns = self.__columns.get(cls)
+            if columns is not None and all(
+                    field in columns.fields for field in ranges):
+                return {key: self.__objects[key]
+                        for key in columns.select(ranges)}
+            return {key: obj
+                    for key, obj in self.__by_class.get(cls, {}).items()
+                    if in_ranges(obj, ranges)}
+
+    def search_places(self, states=(), cities=(), amenities=(), **ranges):
+        """
+        Retrieves the places of some states or cities that
+        have every given amenity, from the foreign key indexes
+        and an index of the places by amenity, built by the
+        first search with amenities.
+
+        Args:
+          states: ids of states, whose cities' places match.
+          cities: ids of cities, whose places match too.
+            Every place matches when neither is given.
+          amenities: ids of amenities a place must all have.
+          ranges: field=(low, high) bounds, as filter() takes.
+
+        Returns:
+          a list of places
+        """
+        self.__hydrate("Place")
+        with self.__lock:
+            places = None
+            if states or cities:
+                city_ids = set(cities)
+                for state_id in states:
+                    city_ids.update(city.id for city in self.children(
+                        "State", state_id, "City").values())
+                places = {}
+                for city_id in city_ids:
+                    places.update(self.children("City", city_id, "Place"))
+            if amenities:
+                if self.__by_amenity is None:
+                    FileStorage.__by_amenity = {}
+                    for key, obj in self.__by_class.get("Place", {}).items():
+                        self.__index_amenities(key, obj)
+                groups = sorted((self.__by_amenity.get(id, {})
+                                 for id in set(amenities)), key=len)
+                if places is None:
+                    places = groups[0]
+                places = {key: obj for key, obj in places.items()
+                          if all(key in group for group in groups)}
+            if ranges:
+                if places is None:
+                    places = self.filter("Place", **ranges)
+                places = {key: obj for key, obj in places.items()
+                          if in_ranges(obj, ranges)}
+            if places is None:
+                places = self.__by_class.get("Place", {})
+            return list(places.values())
+
+    def count_all(self, exact=False):
+        """
+        Counts the objects of every class, from the sizes of
+        the class groups kept by new(), delete() and reload().
+
+        Args:
+          exact: count the objects one by one instead.
+
+        Returns:
+          a dictionary of <class name>: number of objects
+        """
+        if not exact:
+            return {name: self.count(name) for name in classes}
+        counts = dict.fromkeys(classes, 0)
+        with self.__lock:
+            keys = chain(self.__objects,
+                         (key for raw in self.__raw.values() for key in raw))
+            for key in keys:
+                name = key.split(".")[0]
+                if name in counts:
+                    counts[name] += 1
+        return counts
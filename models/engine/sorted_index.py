@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Contains the SortedIndex class
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from models.base_model import parse_time
+
+
+class SortedIndex:
+    """keeps the ids of the objects of one class sorted by (created_at, id)"""
+
+    def __init__(self, objs=None):
+        """
+        Instantiates a SortedIndex.
+
+        Args:
+          objs: dictionary of <class name>.id: object to index, if any.
+        """
+        # dictionary - <class name>.id: its entry in entries
+        self.positions = {key: sort_key(obj)
+                          for key, obj in (objs or {}).items()}
+        # list - sorted (created_at, id) of every object
+        self.entries = sorted(self.positions.values())
+
+    def __len__(self):
+        """returns the number of objects in the index"""
+        return len(self.entries)
+
+    def set(self, key, obj):
+        """adds obj under key, or moves it if its created_at changed"""
+        entry = sort_key(obj)
+        old = self.positions.get(key)
+        if old == entry:
+            return
+        if old is not None:
+            del self.entries[bisect_left(self.entries, old)]
+        insort(self.entries, entry)
+        self.positions[key] = entry
+
+    def remove(self, key):
+        """removes the entry of key"""
+        old = self.positions.pop(key, None)
+        if old is not None:
+            del self.entries[bisect_left(self.entries, old)]
+
+    def after(self, after=None, limit=None):
+        """
+        Finds the entries that follow a given one.
+
+        Args:
+          after: (created_at, id) to start after, None to start at the first.
+          limit: maximum number of entries, None for all.
+
+        Returns:
+          the list of (created_at, id) that follow after
+        """
+        start = 0 if after is None else bisect_right(self.entries, after)
+        end = None if limit is None else start + limit
+        return self.entries[start:end]
+
+
+def sort_key(obj):
+    """returns the (created_at, id) of obj, created_at as a datetime"""
+    created_at = getattr(obj, "created_at", None)
+    if type(created_at) is str:
+        try:
+            created_at = parse_time(created_at)
+        except ValueError:
+            created_at = None
+    if not isinstance(created_at, datetime):
+        created_at = datetime.min
+    return (created_at, str(getattr(obj, "id", "")))
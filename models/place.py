@@ -4,7 +4,8 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index
+from sqlalchemy import Table
 from sqlalchemy.orm import relationship
 
 if models.storage_t == 'db':
@@ -23,6 +24,9 @@ class Place(BaseModel, Base):
     """Representation of Place """
     if models.storage_t == 'db':
         __tablename__ = 'places'
+        __table_args__ = (Index("ix_places_page", "created_at", "id"),
+                          Index("ix_places_city_page", "city_id",
+                                "created_at", "id"))
         city_id = Column(String(60), ForeignKey('cities.id'), nullable=False)
         user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
         name = Column(String(128), nullable=False)
@@ -39,17 +43,12 @@ class Place(BaseModel, Base):
                                  backref="place_amenities",
                                  viewonly=False)
     else:
-        city_id = ""
-        user_id = ""
-        name = ""
-        description = ""
-        number_rooms = 0
-        number_bathrooms = 0
-        max_guest = 0
-        price_by_night = 0
-        latitude = 0.0
-        longitude = 0.0
-        amenity_ids = []
+        defaults = {"city_id": "", "user_id": "", "name": "",
+                    "description": "", "number_rooms": 0,
+                    "number_bathrooms": 0, "max_guest": 0,
+                    "price_by_night": 0, "latitude": 0.0, "longitude": 0.0,
+                    "amenity_ids": []}
+        __slots__ = tuple(defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes Place"""
@@ -60,20 +59,16 @@ class Place(BaseModel, Base):
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return list(models.storage.children(Place, self.id,
+                                                Review).values())
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
             amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
+            for amenity_id in self.amenity_ids:
+                amenity = models.storage.get(Amenity, amenity_id)
+                if amenity is not None:
                     amenity_list.append(amenity)
             return amenity_list
@@ -4,7 +4,7 @@ import models
 from models.base_model import BaseModel, Base
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from sqlalchemy.orm import relationship
 
 
@@ -12,6 +12,7 @@ class User(BaseModel, Base):
     """Representation of a user """
     if models.storage_t == 'db':
         __tablename__ = 'users'
+        __table_args__ = (Index("ix_users_page", "created_at", "id"),)
         email = Column(String(128), nullable=False)
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
@@ -20,10 +21,9 @@ class User(BaseModel, Base):
                               cascade="all, delete-orphan")
         reviews = relationship("Review", backref="user")
     else:
-        email = ""
-        password = ""
-        first_name = ""
-        last_name = ""
+        defaults = {"email": "", "password": "", "first_name": "",
+                    "last_name": ""}
+        __slots__ = tuple(defaults)
 
     def __init__(self, *args, **kwargs):
         """initializes user"""
@@ -4,7 +4,9 @@
 default model for the flask app instance
 """
 
+import gzip
 import unittest
+from api.v1 import compression
 from api.v1.app import app
 
 
@@ -126,6 +128,25 @@ class Test_Index(unittest.TestCase):
                                    "/nonexistent_endpoint")
         self.assertEqual(response.status_code, 404)
 
+    def test_gzip(self):
+        """
+        Test case for checking that responses are gzipped on request
+        """
+        plain = self.client.get(self.home + "/amenities").data
+        min_size = compression.min_size
+        try:
+            compression.min_size = 0
+            response = self.client.get(self.home + "/amenities",
+                                       headers={"Accept-Encoding": "gzip"})
+        finally:
+            compression.min_size = min_size
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertEqual(gzip.decompress(response.data), plain)
+        response = self.client.get(self.home + "/status",
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
 
 class Test_404ErrorHandler(unittest.TestCase):
     """
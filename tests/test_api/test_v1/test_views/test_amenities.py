@@ -42,6 +42,34 @@ class Test_AmenityAPI(unittest.TestCase):
         data = response.get_json()
         self.assertIsInstance(data, list)
 
+    def test_get_all_amenities_streamed(self):
+        """
+        Test that GET /amenities streams the same JSON
+        array that serializing the list at once gives.
+        """
+        from models import storage
+        from models.amenity import Amenity
+        response = self.client.get(self.url)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.get_data(as_text=True), json.dumps([
+            amenity.to_dict()
+            for amenity in storage.all(Amenity).values()
+            ]))
+
+    def test_get_all_amenities_ndjson(self):
+        """
+        Test that GET /amenities sends one amenity per line
+        when asked for NDJSON.
+        """
+        expected = self.client.get(self.url).get_json()
+        for query, headers in (("?format=ndjson", {}),
+                               ("", {"Accept": "application/x-ndjson"})):
+            response = self.client.get(self.url + query, headers=headers)
+            self.assertEqual(response.content_type, "application/x-ndjson")
+            lines = response.get_data(as_text=True).splitlines()
+            self.assertEqual([json.loads(line) for line in lines], expected)
+
     def test_get_specific_amenity(self):
         """
         Test the GET /amenities/<amenity_id> endpoint to
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+
+"""
+Models for the routes of the batch_views
+"""
+
+import unittest
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+class Test_BatchAPI(unittest.TestCase):
+    """
+    This class contains unit tests for the batch
+    API endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test
+        method is run.
+        """
+        app.config['TESTING'] = True
+        self.url = "http://0.0.0.0:5000/api/v1/batch"
+        self.client = app.test_client()
+        self.state = State(name="Batch")
+        self.city = City(name="Batch", state_id=self.state.id)
+        self.user = User(email="batch@example.com", password="pwd")
+        for obj in (self.state, self.city, self.user):
+            storage.new(obj)
+        storage.save()
+
+    def tearDown(self):
+        """
+        Clean up the test environment after each test
+        method is run.
+        """
+        for obj in (self.city, self.state, self.user):
+            storage.delete(obj)
+        storage.save()
+
+    def test_batch_create_update_delete(self):
+        """
+        Test that a batch creates a place and its reviews,
+        then updates and deletes them.
+        """
+        reviews = [{"__class__": "Review", "place_id": "batch-place",
+                    "user_id": self.user.id, "text": str(i)}
+                   for i in range(3)]
+        response = self.client.post(self.url, json={"create": [
+            {"__class__": "Place", "id": "batch-place",
+             "city_id": self.city.id, "user_id": self.user.id,
+             "name": "Loft"}] + reviews})
+        self.assertEqual(response.status_code, 200)
+        ids = response.get_json()["create"]
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(len(storage.children(Place, "batch-place", Review)),
+                         3)
+
+        response = self.client.post(self.url, json={"update": [
+            {"__class__": "Place", "id": "batch-place", "name": "Flat",
+             "city_id": "elsewhere"}]})
+        self.assertEqual(response.status_code, 200)
+        place = storage.get(Place, "batch-place")
+        self.assertEqual(place.name, "Flat")
+        self.assertEqual(place.city_id, self.city.id)
+
+        response = self.client.post(self.url, json={"delete": [
+            {"__class__": "Review", "id": id} for id in ids[1:]] + [
+            {"__class__": "Place", "id": "batch-place"}]})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(storage.get(Place, "batch-place"))
+        self.assertEqual(storage.children(Place, "batch-place", Review), {})
+
+    def test_batch_is_all_or_nothing(self):
+        """
+        Test that an invalid object rejects the whole batch.
+        """
+        count = storage.count(City)
+        response = self.client.post(self.url, json={"create": [
+            {"__class__": "City", "state_id": self.state.id, "name": "A"},
+            {"__class__": "City", "state_id": "nowhere", "name": "B"}]})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json(),
+                         {"error": "Not found", "op": "create", "index": 1})
+        response = self.client.post(self.url, json={"create": [
+            {"__class__": "City", "state_id": self.state.id}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Missing name")
+        response = self.client.post(self.url, data="[]")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(storage.count(City), count)
+
+    def test_batch_rejects_properties(self):
+        """
+        Test that a batch assigning a property changes nothing,
+        not even the objects before it.
+        """
+        count = storage.count(State)
+        response = self.client.post(self.url, json={
+            "create": [{"__class__": "State", "name": "Leaked"}],
+            "update": [{"__class__": "State", "id": self.state.id,
+                        "name": "Renamed"},
+                       {"__class__": "State", "id": self.state.id,
+                        "cities": 1}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(),
+                         {"error": "Invalid cities", "op": "update",
+                          "index": 1})
+        self.assertEqual(storage.count(State), count)
+        self.assertEqual(storage.get(State, self.state.id).name, "Batch")
+
+    def test_batch_create_existing_id(self):
+        """
+        Test that a batch cannot create an object under an id
+        already stored or given twice.
+        """
+        response = self.client.post(self.url, json={"create": [
+            {"__class__": "State", "id": self.state.id, "name": "Hijack"}]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json(),
+                         {"error": "Already exists", "op": "create",
+                          "index": 0})
+        self.assertEqual(storage.get(State, self.state.id).name, "Batch")
+        response = self.client.post(self.url, json={"create": [
+            {"__class__": "State", "id": "batch-twice", "name": "A"},
+            {"__class__": "State", "id": "batch-twice", "name": "B"}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Duplicate id")
+        self.assertIsNone(storage.get(State, "batch-twice"))
@@ -54,6 +54,15 @@ class Test_StatsEndpoint(unittest.TestCase):
         self.assertIn('states', data)
         self.assertIn('users', data)
 
+    def test_stats_exact(self):
+        """
+        Test if the stats endpoint recounts with ?exact=true
+        """
+        response = self.client.get(self.stats_url)
+        exact = self.client.get(self.stats_url + "?exact=true")
+        self.assertEqual(exact.status_code, 200)
+        self.assertEqual(exact.get_json(), response.get_json())
+
     def test_stats_response_format(self):
         """
         Test if the stats endpoint returns the expected response format
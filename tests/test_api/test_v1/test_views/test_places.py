@@ -4,3 +4,87 @@
 """
 Models for the routes of the place_views
 """
+
+import unittest
+import models
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class Test_PlaceAPI(unittest.TestCase):
+    """
+    This class contains unit tests for the Place
+    API endpoints.
+    """
+
+    def setUp(self):
+        """
+        Set up the test environment before each test
+        method is run.
+        """
+        app.config['TESTING'] = True
+        self.url = "http://0.0.0.0:5000/api/v1/places_search"
+        self.client = app.test_client()
+        self.state = State(name="Search")
+        self.city = City(name="Search", state_id=self.state.id)
+        self.user = User(email="search@example.com", password="pwd")
+        self.places = [Place(city_id=self.city.id, user_id=self.user.id,
+                             name="Place {}".format(price),
+                             price_by_night=price)
+                       for price in (60, 120)]
+        for obj in [self.state, self.city, self.user] + self.places:
+            storage.new(obj)
+        storage.save()
+
+    def tearDown(self):
+        """
+        Clean up the test environment after each test
+        method is run.
+        """
+        for obj in self.places + [self.city, self.state, self.user]:
+            storage.delete(obj)
+        storage.save()
+
+    def test_search_places(self):
+        """
+        Test that POST /places_search returns the places of the
+        given states in the given ranges.
+        """
+        response = self.client.post(self.url, json={
+            "states": [self.state.id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual([place["id"] for place in response.get_json()],
+                              [place.id for place in self.places])
+        response = self.client.post(self.url, json={
+            "cities": [self.city.id], "price_by_night": [100, None]})
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         [self.places[1].id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places_amenities(self):
+        """
+        Test that POST /places_search only returns the places
+        having every given amenity.
+        """
+        self.places[0].amenity_ids = ["wifi", "pool"]
+        self.places[1].amenity_ids = ["wifi"]
+        response = self.client.post(self.url, json={
+            "states": [self.state.id], "amenities": ["pool", "wifi"]})
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         [self.places[0].id])
+
+    def test_search_places_invalid(self):
+        """
+        Test that POST /places_search rejects invalid searches.
+        """
+        response = self.client.post(self.url, data="{}")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {"error": "Not a JSON"})
+        response = self.client.post(self.url, json={"cities": "nowhere"})
+        self.assertEqual(response.get_json(), {"error": "Invalid cities"})
+        response = self.client.post(self.url, json={"max_guest": [1]})
+        self.assertEqual(response.status_code, 400)
@@ -5,6 +5,7 @@ Models for the routes of the state_views
 """
 
 
+import base64
 import json
 from flask import Flask
 import unittest
@@ -28,6 +29,74 @@ class Test_StateAPI(unittest.TestCase):
         data = response.get_json()
         self.assertIsInstance(data, list)
 
+    def test_get_states_by_page(self):
+        response = self.client.get(self.states_url)
+        expected = [state["id"] for state in response.get_json()]
+        ids = []
+        url = self.states_url + "?limit=1"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [state["id"] for state in response.get_json()]
+            link = response.headers.get("Link")
+            url = link and link[1:link.index(">")]
+        self.assertEqual(sorted(ids), sorted(expected))
+        self.assertEqual(len(ids), len(set(ids)))
+        response = self.client.get(self.states_url + "?limit=0")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.states_url + "?cursor=nope")
+        self.assertEqual(response.status_code, 400)
+        for value in (["2020-01-01T00:00:00+00:00", "x"],
+                      ["2020-01-01T00:00:00.000000", 1], {"a": 1, "b": 2}):
+            cursor = base64.urlsafe_b64encode(json.dumps(value).encode())
+            response = self.client.get("{}?limit=1&cursor={}".format(
+                self.states_url, cursor.decode()))
+            self.assertEqual(response.status_code, 400)
+
+    def test_get_states_fields(self):
+        response = self.client.get(self.states_url + "?fields=id,name")
+        self.assertEqual(response.status_code, 200)
+        for state in response.get_json():
+            self.assertLessEqual(set(state), {"id", "name"})
+            response = self.client.get(
+                "{}/{}?fields=id".format(self.states_url, state["id"]))
+            self.assertEqual(response.get_json(), {"id": state["id"]})
+
+    def test_get_states_not_modified(self):
+        response = self.client.get(self.states_url)
+        response.close()
+        tag = response.headers["ETag"]
+        response = self.client.get(self.states_url,
+                                   headers={"If-None-Match": tag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        response = self.client.post(self.states_url, json={"name": "Ogun"})
+        state = response.get_json()
+        response = self.client.get(self.states_url,
+                                   headers={"If-None-Match": tag})
+        response.close()
+        self.assertEqual(response.status_code, 200)
+        url = "{}/{}".format(self.states_url, state["id"])
+        response = self.client.get(url)
+        for headers in ({"If-None-Match": response.headers["ETag"]},
+                        {"If-Modified-Since":
+                         response.headers["Last-Modified"]}):
+            response = self.client.get(url, headers=headers)
+            self.assertEqual(response.status_code, 304)
+        self.client.delete(url)
+
+    def test_get_states_cached(self):
+        first = self.client.get(self.states_url + "?fields=id").data
+        self.assertEqual(
+            self.client.get(self.states_url + "?fields=id").data, first)
+        response = self.client.post(self.states_url, json={"name": "Oyo"})
+        state = response.get_json()
+        data = self.client.get(self.states_url + "?fields=id").get_json()
+        self.assertIn({"id": state["id"]}, data)
+        self.client.delete("{}/{}".format(self.states_url, state["id"]))
+        self.assertEqual(
+            self.client.get(self.states_url + "?fields=id").data, first)
+
     def test_get_specific_state(self):
         # Assuming there is at least one state in the database
         response_all_states = self.client.get(self.states_url)
@@ -7,6 +7,7 @@ import pep8 as pycodestyle
 import time
 import unittest
 from unittest import mock
+from models.place import Place
 BaseModel = models.base_model.BaseModel
 module_doc = models.base_model.__doc__
 
@@ -138,6 +139,17 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_fields(self):
+        """test that to_dict with fields only returns those attributes"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        bm = BaseModel()
+        bm.name = "Holberton"
+        self.assertEqual(bm.to_dict(["id", "name", "missing"]),
+                         {"id": bm.id, "name": "Holberton"})
+        self.assertEqual(bm.to_dict(["created_at", "__class__"]),
+                         {"created_at": bm.created_at.strftime(t_format),
+                          "__class__": "BaseModel"})
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -158,3 +170,53 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_setattr_flags_dirty(self):
+        """Test that assigning an attribute flags the instance as changed"""
+        inst = BaseModel()
+        inst._dirty = False
+        inst.name = "Holberton"
+        self.assertTrue(inst._dirty)
+        self.assertNotIn("_dirty", inst.__dict__)
+        self.assertNotIn("_dirty", inst.to_dict())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_getattr_list_default(self):
+        """Test that reading a list default does not flag a change"""
+        place = Place()
+        place._dirty = False
+        self.assertEqual(place.amenity_ids, [])
+        self.assertFalse(place._dirty)
+        place.amenity_ids.append("wifi")
+        self.assertEqual(place.amenity_ids, ["wifi"])
+        self.assertEqual(Place.defaults["amenity_ids"], [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_setattr_class_attribute_names(self):
+        """Test that names of methods and class attributes can be set"""
+        inst = BaseModel()
+        inst.defaults = "x"
+        inst.to_dict = "y"
+        self.assertEqual(BaseModel.defaults, {})
+        self.assertEqual(inst.__dict__["defaults"], "x")
+        self.assertEqual(inst.__dict__["to_dict"], "y")
+        del inst.defaults
+        self.assertNotIn("defaults", inst.__dict__)
+
+    def test_time_codec(self):
+        """Test that parse_time and format_time round-trip the time format"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        now = datetime.utcnow()
+        string = models.base_model.format_time(now)
+        self.assertEqual(string, now.strftime(t_format))
+        self.assertEqual(models.base_model.parse_time(string), now)
+        no_micro = datetime(2017, 9, 28, 21, 3, 54)
+        self.assertEqual(models.base_model.format_time(no_micro),
+                         no_micro.strftime(t_format))
+        inst = BaseModel(created_at=string, updated_at=string)
+        self.assertEqual(inst.created_at, now)
+        for string in ("2020-01-01T00:00:00+00:00", "2020-01-01",
+                       "2020-01-01T00:00:00.00000Z"):
+            with self.assertRaises(ValueError):
+                models.base_model.parse_time(string)
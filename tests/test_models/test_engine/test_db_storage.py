@@ -221,3 +221,85 @@ class TestDBStorage(unittest.TestCase):
             count_city,
             len(self.db_storage.all(City))
             )
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_count_all(self):
+        """Test that count_all matches count for every class"""
+        self.db_storage.new(State(name="Nevada"))
+        self.db_storage.save()
+        counts = self.db_storage.count_all()
+        for cls in [Amenity, City, Place, Review, State, User]:
+            self.assertEqual(counts[cls.__name__], self.db_storage.count(cls))
+        self.assertEqual(sum(counts.values()), self.db_storage.count())
+        state = State(name="Vermont")
+        self.db_storage.new(state)
+        self.db_storage.save()
+        self.assertEqual(self.db_storage.count_all()["State"],
+                         counts["State"] + 1)
+        self.db_storage.delete(state)
+        self.db_storage.save()
+        self.assertEqual(self.db_storage.count_all(), counts)
+        self.assertEqual(self.db_storage.count_all(exact=True), counts)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_children(self):
+        """Test that children returns the objects of a parent only"""
+        state = State(name="Utah")
+        other = State(name="Idaho")
+        city = City(name="Provo", state_id=state.id)
+        self.db_storage.new(state)
+        self.db_storage.new(other)
+        self.db_storage.new(city)
+        self.db_storage.save()
+        children = self.db_storage.children(State, state.id, City)
+        self.assertEqual(list(children), ["City.{}".format(city.id)])
+        self.assertEqual(self.db_storage.children(State, other.id, City), {})
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """Test that page walks a class in (created_at, id) order"""
+        for name in ("Ohio", "Iowa", "Maine"):
+            self.db_storage.new(State(name=name))
+        self.db_storage.save()
+        pages = self.db_storage.page(State, 2)
+        while True:
+            last = pages[-1]
+            page = self.db_storage.page(State, 2, (last.created_at, last.id))
+            if not page:
+                break
+            pages += page
+        self.assertEqual(pages, sorted(self.db_storage.all(State).values(),
+                                       key=lambda s: (s.created_at, s.id)))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_places(self):
+        """Test that search_places matches states, cities and amenities"""
+        state = State(name="Texas")
+        city = City(name="Austin", state_id=state.id)
+        user = User(email="search@example.com", password="pwd")
+        wifi = Amenity(name="Wifi")
+        place = Place(city_id=city.id, user_id=user.id, name="Loft",
+                      price_by_night=80)
+        place.amenities.append(wifi)
+        for obj in (state, city, user, wifi, place):
+            self.db_storage.new(obj)
+        self.db_storage.save()
+        self.assertIn(place, self.db_storage.search_places(
+            states=[state.id], amenities=[wifi.id]))
+        self.assertEqual(self.db_storage.search_places(
+            cities=[city.id], price_by_night=(100, None)), [])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_generation(self):
+        """Test that every commit changing a class changes its version"""
+        before = self.db_storage.generation(State)
+        state = State(name="Nevada")
+        self.db_storage.new(state)
+        self.db_storage.save()
+        after = self.db_storage.generation(State)
+        self.assertNotEqual(after, before)
+        state.name = "Oregon"
+        self.db_storage.save()
+        self.assertNotEqual(self.db_storage.generation(State), after)
+        self.assertEqual(self.db_storage.generation(State, City, "x"),
+                         self.db_storage.generation(State))
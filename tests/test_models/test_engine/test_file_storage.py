@@ -19,6 +19,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -225,3 +226,471 @@ class TestFileStorage(unittest.TestCase):
             self.storage.count(Amenity),
             len(self.storage.all(Amenity))
             )
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) only returns the objects of cls"""
+        state = State()
+        city = City()
+        self.storage.new(state)
+        self.storage.new(city)
+        states = self.storage.all(State)
+        self.assertIn("State." + state.id, states)
+        self.assertNotIn("City." + city.id, states)
+        for obj in states.values():
+            self.assertIs(type(obj), State)
+        self.assertEqual(states, self.storage.all("State"))
+        self.storage.delete(state)
+        self.assertNotIn("State." + state.id, self.storage.all(State))
+        self.storage.delete(city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_all(self):
+        """Test that count_all matches count for every class"""
+        self.storage.new(Review())
+        counts = self.storage.count_all()
+        for name, cls in classes.items():
+            self.assertEqual(counts[name], self.storage.count(cls))
+        self.assertGreaterEqual(counts["Review"], 1)
+        self.assertEqual(self.storage.count_all(exact=True), counts)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_reloads_only_when_changed(self):
+        """Test that close only re-reads file.json after an outside write"""
+        instance = State(name="Lagos")
+        self.storage.new(instance)
+        self.storage.save()
+        instance.name = "unsaved"
+        self.storage.close()
+        self.assertIs(self.storage.get(State, instance.id), instance)
+        self.assertEqual(instance.name, "unsaved")
+        with open("file.json", "w") as f:
+            f.write(js({"State.456": {"__class__": "State", "id": "456"}}))
+        self.storage.close()
+        self.assertIn("State.456", self.storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_journal(self):
+        """Test that journal mode appends changes and reload replays them"""
+        journal_path = FileStorage._FileStorage__journal_path
+        FileStorage._FileStorage__journal = True
+        try:
+            self.storage.save()
+            with open("file.json", "r") as f:
+                snapshot = f.read()
+            instance = State(name="Kano")
+            self.storage.new(instance)
+            self.storage.save()
+            with open("file.json", "r") as f:
+                self.assertEqual(f.read(), snapshot)
+            with open(journal_path, "r") as f:
+                entry = json.loads(f.readlines()[-1])
+            self.assertEqual(entry["key"], "State." + instance.id)
+            self.assertEqual(entry["obj"]["name"], "Kano")
+            instance.name = "Katsina"
+            self.storage.save()
+            with open(journal_path, "r") as f:
+                entry = json.loads(f.readlines()[-1])
+            self.assertEqual(entry["obj"]["name"], "Katsina")
+            with open(journal_path, "a") as f:
+                f.write('{"key": "State.torn", "obj": {"__cl')
+            object.__setattr__(instance, "name", "not flagged")
+            self.storage.reload()
+            self.assertEqual(
+                self.storage.get(State, instance.id).name, "Katsina")
+            self.storage.delete(self.storage.get(State, instance.id))
+        finally:
+            FileStorage._FileStorage__journal = False
+            self.storage.save()
+        self.assertFalse(os.path.exists(journal_path))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_fsync_batch(self):
+        """
+        Test that batch mode puts journal fsyncs off, not those of
+        snapshots and of their directory
+        """
+        FileStorage._FileStorage__fsync_interval = 60
+        instance = State(name="Benue")
+        try:
+            with mock.patch.object(file_storage, "fsync") as fsync:
+                self.storage.save()
+                self.assertEqual(fsync.call_count, 2)
+                FileStorage._FileStorage__journal = True
+                self.storage.new(instance)
+                self.storage.save()
+                self.assertEqual(fsync.call_count, 2)
+                timer = FileStorage._FileStorage__sync_timer
+                self.assertIsNotNone(timer)
+                timer.cancel()
+                self.storage._FileStorage__sync_journal()
+                self.assertEqual(fsync.call_count, 3)
+                self.assertIsNone(FileStorage._FileStorage__sync_timer)
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__fsync_interval = 1
+            self.storage.delete(instance)
+            self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal_after_cut_compaction(self):
+        """Test that a compaction cut short does not replay old entries"""
+        compact_at = FileStorage._FileStorage__compact_at
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__compact_at = 3
+        instance = State(name="v1")
+        try:
+            self.storage.save()
+            for name in ("v1", "v2", "v3"):
+                instance.name = name
+                self.storage.new(instance)
+                if name != "v3":
+                    self.storage.save()
+            with mock.patch.object(file_storage, "remove",
+                                   side_effect=OSError):
+                with self.assertRaises(OSError):
+                    self.storage.save()
+            FileStorage._FileStorage__pending.clear()
+            self.storage.reload()
+            self.assertEqual(self.storage.get(State, instance.id).name, "v3")
+        finally:
+            FileStorage._FileStorage__journal = False
+            FileStorage._FileStorage__compact_at = compact_at
+            self.storage.delete(self.storage.get(State, instance.id))
+            self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_replaces_file(self):
+        """Test that save renames a new file over file.json"""
+        self.storage.save()
+        inode = os.stat("file.json").st_ino
+        self.storage.save()
+        self.assertNotEqual(os.stat("file.json").st_ino, inode)
+        self.assertFalse(os.path.exists("file.json.{}.tmp".format(
+            os.getpid())))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_keeps_assignments_during_to_dict(self):
+        """Test that an assignment made while serializing is saved later"""
+        instance = State(name="old")
+        self.storage.new(instance)
+        to_dict = State.to_dict
+
+        def assign_during(obj, *args):
+            result = to_dict(obj, *args)
+            if obj is instance and obj.name == "old":
+                obj.name = "new"
+            return result
+
+        with mock.patch.object(State, "to_dict", assign_during):
+            self.storage.save()
+        self.assertTrue(instance._dirty)
+        self.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)["State." + instance.id]
+        self.assertEqual(saved["name"], "new")
+        self.storage.delete(instance)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_sees_lists_changed_in_place(self):
+        """Test that save writes lists appended to without assignment"""
+        place = Place(amenity_ids=["a"])
+        other = Place()
+        self.storage.new(place)
+        self.storage.new(other)
+        self.storage.save()
+        place.amenity_ids.append("b")
+        self.assertEqual(other.amenity_ids, [])
+        self.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved["Place." + place.id]["amenity_ids"],
+                         ["a", "b"])
+        self.assertEqual(saved["Place." + other.id].get("amenity_ids", []),
+                         [])
+        self.storage.delete(place)
+        self.storage.delete(other)
+        self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reuses_unchanged_objects(self):
+        """Test that save only re-serializes objects flagged as changed"""
+        instance = State(name="Enugu")
+        self.storage.new(instance)
+        self.storage.save()
+        self.assertFalse(instance._dirty)
+        object.__setattr__(instance, "name", "not flagged")
+        self.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)["State." + instance.id]
+        self.assertEqual(saved["name"], "Enugu")
+        instance.name = "Abuja"
+        self.assertTrue(instance._dirty)
+        self.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)["State." + instance.id]
+        self.assertEqual(saved["name"], "Abuja")
+        self.storage.delete(instance)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_coalesce(self):
+        """Test that coalesced saves are written together by one flush"""
+        self.storage.save()
+        FileStorage._FileStorage__coalesce = 60
+        try:
+            instance = State(name="Oyo")
+            self.storage.new(instance)
+            self.storage.save()
+            self.storage.save()
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + instance.id, json.load(f))
+            self.storage.flush()
+            self.storage.sync()
+            with open("file.json", "r") as f:
+                self.assertIn("State." + instance.id, json.load(f))
+            self.assertIsNone(FileStorage._FileStorage__timer)
+        finally:
+            FileStorage._FileStorage__coalesce = 0
+            self.storage.delete(instance)
+            self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_keeps_held_back_saves(self):
+        """Test that close does not replace objects not written yet"""
+        instance = State(name="Ekiti")
+        self.storage.new(instance)
+        self.storage.save()
+        FileStorage._FileStorage__coalesce = 60
+        try:
+            instance.name = "Ondo"
+            self.storage.new(instance)
+            self.storage.save()
+            with open("file.json", "r") as f:
+                records = json.load(f)
+            records["State.789"] = {"__class__": "State", "id": "789"}
+            with open("file.json", "w") as f:
+                f.write(js(records))
+            self.storage.close()
+            self.assertIn("State.789", self.storage.all(State))
+            self.assertIs(self.storage.get(State, instance.id), instance)
+            self.storage.flush()
+            with open("file.json", "r") as f:
+                saved = json.load(f)["State." + instance.id]
+            self.assertEqual(saved["name"], "Ondo")
+        finally:
+            FileStorage._FileStorage__coalesce = 0
+            self.storage.delete(instance)
+            self.storage.delete(self.storage.get(State, "789"))
+            self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sync_raises_failed_flush(self):
+        """Test that sync reports a failed write instead of returning"""
+        file_path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__coalesce = 60
+        instance = State(name="Osun")
+        try:
+            self.storage.new(instance)
+            self.storage.save()
+            FileStorage._FileStorage__file_path = "no/such/dir/file.json"
+            with self.assertRaises(OSError):
+                self.storage.flush()
+            with self.assertRaises(OSError):
+                self.storage.sync()
+            FileStorage._FileStorage__file_path = file_path
+            self.storage.flush()
+            self.storage.sync()
+            with open("file.json", "r") as f:
+                self.assertIn("State." + instance.id, json.load(f))
+        finally:
+            FileStorage._FileStorage__file_path = file_path
+            FileStorage._FileStorage__coalesce = 0
+            self.storage.delete(instance)
+            self.storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_streams_records(self):
+        """Test that reload reads a file larger than one read chunk"""
+        records = {}
+        for i in range(200):
+            records["City.big{}".format(i)] = {
+                "__class__": "City", "id": "big{}".format(i),
+                "name": "x" * 500}
+        with open("file.json", "w") as f:
+            json.dump(records, f, indent=4)
+        self.storage.reload()
+        for key in records:
+            self.assertIn(key, self.storage.all(City))
+            self.storage.delete(self.storage.all()[key])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_lazy(self):
+        """Test that lazy mode only instantiates the records when used"""
+        with open("file.json", "w") as f:
+            f.write(js({"Amenity.lazy": {
+                "__class__": "Amenity", "id": "lazy", "name": "Wifi",
+                "created_at": "2017-09-28T21:03:54.052298",
+                "updated_at": "2017-09-28T21:03:54.052298"}}))
+        FileStorage._FileStorage__lazy = True
+        try:
+            self.storage.reload()
+            objects = self.storage._FileStorage__objects
+            self.assertNotIn("Amenity.lazy", objects)
+            self.assertEqual(self.storage.count(Amenity),
+                             len(self.storage.all(Amenity)))
+            self.storage.reload()
+            self.storage.save()
+            self.assertNotIn("Amenity.lazy", objects)
+            amenity = self.storage.get(Amenity, "lazy")
+            self.assertIsInstance(amenity, Amenity)
+            self.assertEqual(amenity.name, "Wifi")
+            self.assertIs(objects["Amenity.lazy"], amenity)
+            self.storage.delete(amenity)
+        finally:
+            FileStorage._FileStorage__lazy = False
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filter(self):
+        """Test that filter returns the same objects with or without columns"""
+        places = [Place(price_by_night=price, max_guest=price // 100)
+                  for price in (40, 90, 150, 300)]
+        for place in places:
+            self.storage.new(place)
+        ranges = {"price_by_night": (50, 200), "max_guest": (None, 2)}
+        expected = {"Place." + places[1].id, "Place." + places[2].id}
+        try:
+            for columnar in (False, True):
+                FileStorage._FileStorage__columnar = columnar
+                self.assertTrue(expected.issubset(
+                    self.storage.filter(Place, **ranges)))
+                places[1].price_by_night = 10
+                self.assertNotIn("Place." + places[1].id,
+                                 self.storage.filter(Place, **ranges))
+                places[1].price_by_night = 90
+            self.storage.delete(places[2])
+            self.assertNotIn("Place." + places[2].id,
+                             self.storage.filter(Place, **ranges))
+        finally:
+            FileStorage._FileStorage__columnar = False
+            FileStorage._FileStorage__columns = {}
+            for place in places:
+                self.storage.delete(place)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_places(self):
+        """Test that search_places follows the indexes and their updates"""
+        state = State(name="Oyo")
+        city = City(name="Ibadan", state_id=state.id)
+        other = City(name="Ife")
+        places = [Place(city_id=city.id, price_by_night=50,
+                        amenity_ids=["wifi", "pool"]),
+                  Place(city_id=city.id, price_by_night=150,
+                        amenity_ids=["wifi"]),
+                  Place(city_id=other.id, amenity_ids=["wifi", "pool"])]
+        for obj in [state, city, other] + places:
+            self.storage.new(obj)
+        try:
+            self.assertCountEqual(self.storage.search_places(
+                states=[state.id]), places[:2])
+            self.assertCountEqual(self.storage.search_places(
+                states=[state.id], cities=[other.id]), places)
+            self.assertCountEqual(self.storage.search_places(
+                amenities=["wifi", "pool"]), [places[0], places[2]])
+            self.assertEqual(self.storage.search_places(
+                cities=[city.id], amenities=["pool"],
+                price_by_night=(None, 100)), [places[0]])
+            places[1].amenity_ids = ["pool"]
+            places[0].city_id = other.id
+            self.assertEqual(self.storage.search_places(
+                states=[state.id], amenities=["pool"]), [places[1]])
+            self.storage.delete(places[2])
+            self.assertEqual(self.storage.search_places(
+                cities=[other.id], amenities=["wifi"]), [places[0]])
+        finally:
+            FileStorage._FileStorage__by_amenity = None
+            FileStorage._FileStorage__amenity_ids = {}
+            for obj in [state, city, other] + places:
+                self.storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test that page walks a class in (created_at, id) order"""
+        cities = [City(name="City {}".format(i)) for i in range(5)]
+        for city in reversed(cities):
+            self.storage.new(city)
+        first = self.storage.page(City, 2)
+        self.assertEqual(len(first), 2)
+        pages = first
+        while True:
+            last = pages[-1]
+            page = self.storage.page(City, 2, (last.created_at, last.id))
+            if not page:
+                break
+            pages += page
+        self.assertEqual(pages, sorted(self.storage.all(City).values(),
+                                       key=lambda c: (c.created_at, c.id)))
+        late = cities[0]
+        late.created_at = datetime.max
+        self.assertIs(self.storage.page(City)[-1], late)
+        self.storage.delete(late)
+        self.assertNotIn(late, self.storage.page(City))
+        for city in cities[1:]:
+            self.storage.delete(city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_generation(self):
+        """Test that generations change with the objects they cover"""
+        state = State(name="Kano")
+        other = State(name="Lagos")
+        city = City(name="Ikeja", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(other)
+        before = (self.storage.generation(City),
+                  self.storage.generation(City, State, state.id),
+                  self.storage.generation(City, State, other.id))
+        self.storage.new(city)
+        self.assertNotEqual(self.storage.generation(City), before[0])
+        self.assertNotEqual(self.storage.generation(City, State, state.id),
+                            before[1])
+        self.assertEqual(self.storage.generation(City, State, other.id),
+                         before[2])
+        before = self.storage.generation(City, State, other.id)
+        city.state_id = other.id
+        self.assertNotEqual(self.storage.generation(City, State, other.id),
+                            before)
+        before = self.storage.generation(City)
+        self.storage.delete(city)
+        self.assertNotEqual(self.storage.generation(City), before)
+        self.storage.delete(state)
+        self.storage.delete(other)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_existing(self):
+        """Test that existing only returns the ids of stored objects"""
+        state = State(name="Edo")
+        self.storage.new(state)
+        self.assertEqual(self.storage.existing(State, [state.id, "nope"]),
+                         {state.id})
+        self.assertEqual(self.storage.existing(City, [state.id]), set())
+        self.storage.delete(state)
+        self.assertEqual(self.storage.existing("State", [state.id]), set())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_children(self):
+        """Test that the foreign key indexes follow new, update and delete"""
+        state = State(name="Kaduna")
+        other = State(name="Kebbi")
+        city = City(name="Zaria", state_id=state.id)
+        for obj in (state, other, city):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.children(State, state.id, City),
+                         {"City." + city.id: city})
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        self.storage.delete(city)
+        self.assertEqual(other.cities, [])
+        self.storage.delete(state)
+        self.storage.delete(other)
@@ -9,6 +9,7 @@ import models
 from models import place
 from models.base_model import BaseModel
 import pep8
+import tracemalloc
 import unittest
 Place = place.Place
 
@@ -198,3 +199,49 @@ class TestPlace(unittest.TestCase):
         place = Place()
         string = "[Place] ({}) {}".format(place.id, place.__dict__)
         self.assertEqual(string, str(place))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_slots(self):
+        """Test that Place keeps its fields in slots, extras aside"""
+        place = Place(name="Loft", rooms_view="sea")
+        self.assertEqual(Place.__dictoffset__, 0)
+        self.assertEqual(place.name, "Loft")
+        self.assertEqual(place.rooms_view, "sea")
+        self.assertEqual(place.__dict__["rooms_view"], "sea")
+        self.assertEqual(place.to_dict()["name"], "Loft")
+        other = Place()
+        place.amenity_ids.append("amenity")
+        self.assertEqual(other.amenity_ids, [])
+        del place.rooms_view
+        self.assertNotIn("rooms_view", place.to_dict())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_slots_memory(self):
+        """
+        Test that a Place in slots takes less memory than the same
+        fields in an instance __dict__, as Place kept them before
+        """
+        class DictPlace:
+            """a Place keeping its fields in __dict__"""
+
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+        now = datetime.utcnow()
+        record = {"id": "x" * 36, "created_at": now, "updated_at": now,
+                  "city_id": "c" * 36, "user_id": "u" * 36,
+                  "name": "Loft", "description": "Sea view",
+                  "number_rooms": 2, "number_bathrooms": 1,
+                  "max_guest": 4, "price_by_night": 80,
+                  "latitude": 1.5, "longitude": 2.5,
+                  "amenity_ids": []}
+        sizes = {}
+        for cls in (DictPlace, Place):
+            tracemalloc.start()
+            start = tracemalloc.get_traced_memory()[0]
+            objs = [cls(**record) for i in range(1000)]
+            sizes[cls] = (tracemalloc.get_traced_memory()[0] - start) / 1000
+            tracemalloc.stop()
+            del objs
+        self.assertLess(sizes[Place], sizes[DictPlace],
+                        "bytes per object: {}".format(sizes))